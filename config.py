@@ -4,10 +4,44 @@ Configuration module for the Travel Agent MCP server.
 Centralizes API keys, settings, and environment variables.
 """
 
-import json
 import os
 from pathlib import Path
 
+from utils import json_utils
+
+# Parsed workspace config files keyed by path -> (st_mtime_ns, user_config)
+_WS_CACHE = {}
+
+# Tool name aliases resolved to a canonical validation entry
+_ALIAS = {
+    "search_flights": "flights",
+    "flight_search": "flights",
+    "search_hotels": "hotels",
+    "hotel_search": "hotels",
+    "get_weather": "weather",
+    "weather_forecast": "weather",
+    "web_search": "web_search",
+    "geocode_location": "geocode",
+}
+
+# Required parameters per canonical tool, checked by Config.validate_tool_params
+_REQUIRED = {
+    "flights": ("origin", "destination", "departure_date"),
+    "hotels": ("location", "checkin_date", "checkout_date"),
+    "weather": ("location",),
+    "web_search": ("query",),
+    "geocode": ("location",),
+}
+
+
+# Environment values that switch a flag on; anything else (including "0") is off
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
+def _env_flag(name):
+    """Read a boolean flag from the environment."""
+    return os.getenv(name, "").strip().lower() in _TRUE_VALUES
+
 
 class Config:
     """Configuration class for travel agent settings."""
@@ -15,6 +49,7 @@ class Config:
     # API Keys
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+    _RESOLVED_OPENAI_KEY = OPENROUTER_API_KEY or OPENAI_API_KEY or None
 
     # OpenAI/OpenRouter Settings
     OPENAI_API_BASE = os.getenv("OPENAI_API_BASE")
@@ -30,46 +65,69 @@ class Config:
     SERVER_HOST = os.getenv("SERVER_HOST", "localhost")
     SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
     MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", f"http://{SERVER_HOST}:{SERVER_PORT}")
+    MCP_MAX_CONCURRENT_TOOLS = int(os.getenv("MCP_MAX_CONCURRENT_TOOLS", "8"))
+    # Serve memory tools from this process when client and server share a disk
+    MCP_INPROC = _env_flag("MCP_INPROC")
 
     # Tool Settings
     DEFAULT_MAX_RESULTS = 20
     DEFAULT_WEATHER_DAYS = 7
     DEFAULT_CURRENCY = "USD"
+    HOTEL_PARALLELISM = int(os.getenv("HOTEL_PARALLELISM", "3"))
+    FLIGHT_PARALLELISM = int(os.getenv("FLIGHT_PARALLELISM", "4"))
 
     # File Paths
     LOG_DIR = os.getenv("LOG_DIR", "logs")
     SCREENSHOTS_DIR = os.getenv("SCREENSHOTS_DIR", "screenshots")
     PERFORMANCE_LOG_FILE = os.getenv("PERFORMANCE_LOG_FILE", "performance_logs.jsonl")
 
+    # Debug Settings
+    DEBUG = _env_flag("TRAVEL_AGENT_DEBUG")
+
     # Workspace Settings
     _workspace_config = None
+    _workspace_config_mtime_ns = None
 
     @classmethod
     def get_openai_api_key(cls):
         """Get OpenAI API key, preferring OpenRouter if available."""
-        return cls.OPENROUTER_API_KEY or cls.OPENAI_API_KEY
+        return cls._RESOLVED_OPENAI_KEY
 
     @classmethod
     def has_openai_client(cls):
         """Check if OpenAI client can be configured."""
-        return bool(cls.get_openai_api_key())
+        return cls._RESOLVED_OPENAI_KEY is not None
 
     @classmethod
     def get_workspace_config(cls, workspace_path=None):
         """Get workspace-specific configuration."""
-        if cls._workspace_config is None:
+        if (
+            cls._workspace_config is None
+            or cls._workspace_file_mtime_ns(workspace_path)
+            != cls._workspace_config_mtime_ns
+        ):
+            # Not loaded yet, or edited on disk since we last loaded or saved it
             cls._load_workspace_config(workspace_path)
         return cls._workspace_config
 
+    @staticmethod
+    def _workspace_config_file(workspace_path=None):
+        """Path of the workspace config file."""
+        base = Path.cwd() if workspace_path is None else Path(workspace_path)
+        return base / ".travel_agent" / "config.json"
+
+    @classmethod
+    def _workspace_file_mtime_ns(cls, workspace_path=None):
+        """Modification time of the workspace config file, or None if missing."""
+        try:
+            return cls._workspace_config_file(workspace_path).stat().st_mtime_ns
+        except OSError:
+            return None
+
     @classmethod
     def _load_workspace_config(cls, workspace_path=None):
         """Load workspace configuration from .travel_agent/config.json"""
-        if workspace_path is None:
-            workspace_path = Path.cwd()
-        else:
-            workspace_path = Path(workspace_path)
-
-        config_file = workspace_path / ".travel_agent" / "config.json"
+        config_file = cls._workspace_config_file(workspace_path)
 
         # Default workspace config
         defaults = {
@@ -83,32 +141,35 @@ class Config:
             "disabled_tools": [],
         }
 
-        if config_file.exists():
-            try:
-                with open(config_file, "r") as f:
-                    user_config = json.load(f)
-                    defaults.update(user_config)
-            except (json.JSONDecodeError, IOError):
-                pass
-
-        cls._workspace_config = defaults
+        user_config = {}
+        cls._workspace_config_mtime_ns = None
+        try:
+            st = config_file.stat()
+            cls._workspace_config_mtime_ns = st.st_mtime_ns
+            cached = _WS_CACHE.get(config_file)
+            if cached is not None and cached[0] == st.st_mtime_ns:
+                user_config = cached[1]
+            else:
+                with open(config_file, "rb") as f:
+                    user_config = json_utils.loads(f.read())
+                _WS_CACHE[config_file] = (st.st_mtime_ns, user_config)
+        except (json_utils.JSONDecodeError, IOError):
+            pass
+
+        cls._workspace_config = {**defaults, **user_config}
 
     @classmethod
     def save_workspace_config(cls, config_data, workspace_path=None):
         """Save workspace configuration."""
-        if workspace_path is None:
-            workspace_path = Path.cwd()
-        else:
-            workspace_path = Path(workspace_path)
+        config_file = cls._workspace_config_file(workspace_path)
+        config_file.parent.mkdir(parents=True, exist_ok=True)
 
-        config_dir = workspace_path / ".travel_agent"
-        config_dir.mkdir(parents=True, exist_ok=True)
-
-        config_file = config_dir / "config.json"
         with open(config_file, "w") as f:
-            json.dump(config_data, f, indent=2)
+            f.write(json_utils.dumps(config_data, indent=True))
 
         cls._workspace_config = config_data
+        # Our own write shouldn't trigger a reload
+        cls._workspace_config_mtime_ns = config_file.stat().st_mtime_ns
 
     @classmethod
     def get_mcp_servers(cls):
@@ -127,28 +188,11 @@ class Config:
             return validation_errors
 
         # Tool-specific validations
-        if tool_name in ["search_flights", "flight_search"]:
-            required = ["origin", "destination", "departure_date"]
-            for field in required:
-                if not params.get(field):
-                    validation_errors.append(f"Missing required field: {field}")
-
-        elif tool_name in ["search_hotels", "hotel_search"]:
-            required = ["location", "checkin_date", "checkout_date"]
-            for field in required:
-                if not params.get(field):
-                    validation_errors.append(f"Missing required field: {field}")
-
-        elif tool_name in ["get_weather", "weather_forecast"]:
-            if not params.get("location"):
-                validation_errors.append("Missing required field: location")
-
-        elif tool_name == "web_search":
-            if not params.get("query"):
-                validation_errors.append("Missing required field: query")
-
-        elif tool_name == "geocode_location":
-            if not params.get("location"):
-                validation_errors.append("Missing required field: location")
+        canon = _ALIAS.get(tool_name)
+        if canon is None:
+            return validation_errors
+        for field in _REQUIRED[canon]:
+            if not params.get(field):
+                validation_errors.append(f"Missing required field: {field}")
 
         return validation_errors
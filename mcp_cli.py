@@ -7,12 +7,20 @@ Provides start, stop, logs, and status commands.
 import argparse
 import os
 import signal
+import socket
 import subprocess
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
+from config import Config
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # Non-Linux platforms fall back to polling
+    INotify = None
+
 
 class MCPServerCLI:
     def __init__(self):
@@ -32,26 +40,45 @@ class MCPServerCLI:
 
         # Start server process in background
         cmd = [sys.executable, "mcp_server.py", "--daemon"]
-        process = subprocess.Popen(
-            cmd,
-            cwd=self.project_root,
-            stdout=open(self.log_file, "a"),
-            stderr=subprocess.STDOUT,
-            preexec_fn=os.setsid,
-        )
+        log_fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            process = subprocess.Popen(
+                cmd,
+                cwd=self.project_root,
+                stdout=log_fd,
+                stderr=subprocess.STDOUT,
+                preexec_fn=os.setsid if sys.platform != "win32" else None,
+            )
+        finally:
+            # The child has its own copy; don't keep the log open in the CLI
+            os.close(log_fd)
 
         # Save PID
         with open(self.pid_file, "w") as f:
             f.write(str(process.pid))
 
-        # Wait a moment to check if it started successfully
-        time.sleep(2)
-        if self.is_server_running():
-            print(f"MCP server started successfully (PID: {process.pid})")
-            print(f"Logs: {self.log_file}")
-            print("Use 'python mcp_cli.py logs' to view live logs")
-        else:
-            print("Failed to start MCP server")
+        # Wait until the server accepts connections or exits early
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            if process.poll() is not None:
+                print(f"MCP server exited early (code {process.returncode})")
+                print(f"Logs: {self.log_file}")
+                return
+            if self._port_open(Config.SERVER_HOST, Config.SERVER_PORT):
+                print(f"MCP server started successfully (PID: {process.pid})")
+                print(f"Logs: {self.log_file}")
+                print("Use 'python mcp_cli.py logs' to view live logs")
+                return
+            time.sleep(0.05)
+
+        print("Failed to start MCP server (not accepting connections after 5s)")
+        print(f"Logs: {self.log_file}")
+
+    def _port_open(self, host, port):
+        """Check whether something is listening on host:port."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.05)
+            return sock.connect_ex((host, port)) == 0
 
     def stop_server(self):
         """Stop the MCP server."""
@@ -103,10 +130,8 @@ class MCPServerCLI:
 
             try:
                 # Show last 20 lines first
-                with open(self.log_file, "r") as f:
-                    lines = f.readlines()
-                    for line in lines[-20:]:
-                        print(line.rstrip())
+                for line in self._read_last_lines(self.log_file, 20):
+                    print(line.rstrip())
 
                 # Follow new lines
                 self._tail_file(self.log_file)
@@ -115,10 +140,21 @@ class MCPServerCLI:
                 print("\nStopped viewing logs")
         else:
             # Just show recent logs
-            with open(self.log_file, "r") as f:
-                lines = f.readlines()
-                for line in lines[-50:]:
-                    print(line.rstrip())
+            for line in self._read_last_lines(self.log_file, 50):
+                print(line.rstrip())
+
+    def _read_last_lines(self, file_path, n):
+        """Read the last n lines of a file by seeking backwards from the end."""
+        with open(file_path, "rb") as f:
+            f.seek(0, 2)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= n:
+                step = min(8192, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        return data.decode("utf-8", errors="replace").splitlines()[-n:]
 
     def _tail_file(self, file_path):
         """Tail a file like 'tail -f'."""
@@ -126,12 +162,21 @@ class MCPServerCLI:
             # Go to end of file
             f.seek(0, 2)
 
-            while True:
-                line = f.readline()
-                if line:
-                    print(line.rstrip())
-                else:
-                    time.sleep(0.1)
+            if INotify is None:
+                while True:
+                    line = f.readline()
+                    if line:
+                        print(line.rstrip())
+                    else:
+                        time.sleep(0.1)
+
+            # Block until the file is modified instead of waking up to poll
+            with INotify() as inotify:
+                inotify.add_watch(str(file_path), flags.MODIFY)
+                while True:
+                    for line in iter(f.readline, ""):
+                        print(line.rstrip())
+                    inotify.read()
 
     def show_status(self):
         """Show server status."""
@@ -27,7 +27,10 @@ from mcp.server.fastmcp import FastMCP
 
 from config import Config
 from tools.tool_registry import register_all_tools
-from utils.openai_client import has_openai_client
+from utils.browser import close_browser
+from utils.geo_utils import save_geocode_cache
+from utils.http_client import close_http_client
+from utils.mcp_pool import close_mcp_pool
 
 logs_dir = Path(__file__).parent / "logs"
 logs_dir.mkdir(exist_ok=True)
@@ -48,7 +51,7 @@ logging.basicConfig(level=logging.INFO, handlers=handlers)
 tool_logger = logging.getLogger("mcp.tools")
 tool_logger.setLevel(logging.INFO)
 
-app = FastMCP("travel-tools")
+app = FastMCP("travel-tools", host=Config.SERVER_HOST, port=Config.SERVER_PORT)
 register_all_tools(app)
 
 
@@ -70,7 +73,9 @@ async def run_server():
         def timeout_handler(signum, frame):
             logging.warning("Operation timeout - generating partial results")
 
-        signal.signal(signal.SIGALRM, timeout_handler)
+        # SIGALRM does not exist on Windows
+        if hasattr(signal, "SIGALRM"):
+            signal.signal(signal.SIGALRM, timeout_handler)
     setup_timeout_handlers()
     start_time = time.time()
     if not daemon_mode:
@@ -95,6 +100,11 @@ async def run_server():
         logging.error(f"Server error: {e}")
         if not daemon_mode:
             print(f"\nServer error: {e}")
+    finally:
+        await close_browser()
+        await close_http_client()
+        await close_mcp_pool()
+        save_geocode_cache()
 
 
 def main():
@@ -105,6 +115,13 @@ def main():
     args = parser.parse_args()
     global daemon_mode
     daemon_mode = args.daemon
+    try:
+        # uvloop cuts per-request event loop overhead under heavy tool fan-out
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(run_server())
 
 
@@ -14,11 +14,11 @@ def register_airport_tools(app: FastMCP):
     """Register airport-related tools with the FastMCP app."""
 
     @app.tool()
-    async def iata_lookup_tool(term, limit=5):
+    def iata_lookup_tool(term, limit=5):
         """
         Guess IATA codes by city/airport name or exact code.
         """
-        return await iata_lookup(term, limit)
+        return iata_lookup(term, limit)
 
     @app.tool()
     async def nearest_airports(place_or_latlon, limit=5):
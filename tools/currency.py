@@ -4,30 +4,71 @@ Currency conversion tool for the travel agent.
 Provides currency exchange rate functionality.
 """
 
+import asyncio
+import time
+
 from mcp.server.fastmcp import FastMCP
 
+from utils import json_utils
 from utils.http_client import get_http_client
 
+# Exchange rates keyed by (from, to) -> (rate, expiry_ts)
+_RATE_TTL = 60.0
+_rate_cache = {}
+# Rate lookups currently in progress, so concurrent callers share one request
+_rate_inflight = {}
+
 
 def register_currency_tool(app: FastMCP):
     """Register the currency conversion tool with the FastMCP app."""
 
-    @app.tool()
-    async def currency_convert(amount, from_code, to_code):
-        """Convert currency from one code to another."""
-        client = get_http_client()
+    client = get_http_client()
+
+    async def _get_rate(from_code, to_code):
+        """Get the exchange rate for a currency pair, cached for a short TTL."""
+        key = (from_code, to_code)
+        cached = _rate_cache.get(key)
+        if cached:
+            if cached[1] > time.time():
+                return cached[0]
+            del _rate_cache[key]
+
+        task = _rate_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_fetch_rate(from_code, to_code))
+            _rate_inflight[key] = task
+            task.add_done_callback(lambda _: _rate_inflight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(task)
+
+    async def _fetch_rate(from_code, to_code):
+        """Fetch and cache the exchange rate for a currency pair."""
         url = "https://api.exchangerate.host/convert"
         r = await client.get(
-            url,
-            params={"from": from_code.upper(), "to": to_code.upper(), "amount": amount},
+            url, params={"from": from_code, "to": to_code, "amount": 1}
         )
-        j = r.json()
+        j = json_utils.loads(r.content)
+        rate = (j.get("info") or {}).get("rate") or j.get("result")
+        if rate is not None:
+            _rate_cache[(from_code, to_code)] = (rate, time.time() + _RATE_TTL)
+        return rate
+
+    @app.tool()
+    async def currency_convert(amount, from_code, to_code):
+        """Convert currency from one code to another."""
+        try:
+            value = float(amount)
+        except (TypeError, ValueError):
+            return {"success": False, "error": f"Invalid amount: {amount}"}
+        from_code = from_code.upper()
+        to_code = to_code.upper()
+        rate = await _get_rate(from_code, to_code)
         return {
             "query": {
                 "amount": amount,
-                "from": from_code.upper(),
-                "to": to_code.upper(),
+                "from": from_code,
+                "to": to_code,
             },
-            "result": j.get("result"),
-            "info": {"rate": (j.get("info") or {}).get("rate")},
+            "result": value * rate if rate is not None else None,
+            "info": {"rate": rate},
         }
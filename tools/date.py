@@ -4,10 +4,15 @@ Date tool for the travel agent.
 Provides current date functionality.
 """
 
+import time
+
 from mcp.server.fastmcp import FastMCP
 
 from utils.date_utils import get_current_date
 
+# Last formatted date as (timestamp, "YYYY-MM-DD"), reused for up to a second
+_last = (0.0, "")
+
 
 def register_date_tool(app: FastMCP):
     """Register the date tool with the FastMCP app."""
@@ -15,4 +20,10 @@ def register_date_tool(app: FastMCP):
     @app.tool()
     async def get_current_date_tool():
         """Returns the current date in YYYY-MM-DD format."""
-        return get_current_date()
+        global _last
+        now = time.time()
+        if now - _last[0] < 1.0:
+            return _last[1]
+        s = get_current_date()
+        _last = (now, s)
+        return s
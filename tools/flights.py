@@ -6,15 +6,48 @@ Provides flight search and screenshot capture functionality.
 import asyncio
 import base64
 import os
+import re
 import tempfile
 from datetime import datetime, timedelta
+from urllib.parse import quote_plus
 
 from mcp.server.fastmcp import FastMCP
-from playwright.async_api import async_playwright
 
+from config import Config
+from utils.browser import get_browser
 from utils.openai_client import analyze_image_with_vision, has_openai_client
 from utils.prompt_loader import load_prompt
 
+# Prompts are static for the lifetime of the process
+_FLIGHT_PROMPT = load_prompt("flight_analysis_prompt")
+
+# Date formats accepted by the flight tools; a cheap shape check before parsing
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_MONTH_RE = re.compile(r"\d{4}-\d{2}")
+
+
+def _valid_date(value):
+    """True if value is a real calendar date in YYYY-MM-DD format."""
+    if not _DATE_RE.fullmatch(value):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _valid_month(value):
+    """True if value is a real month in YYYY-MM format."""
+    return bool(_MONTH_RE.fullmatch(value)) and 1 <= int(value[5:]) <= 12
+
+
+# Google Flights natural-language search URL; the query is appended encoded
+_FLIGHTS_URL = "https://www.google.com/travel/flights?q="
+
+# Cap concurrent browser contexts when several searches run at once
+_SCREENSHOT_SEM = asyncio.Semaphore(Config.FLIGHT_PARALLELISM)
+
 
 def register_flights_tool(app: FastMCP):
     """Register the Flights tool with the FastMCP app."""
@@ -22,32 +55,39 @@ def register_flights_tool(app: FastMCP):
     def build_flight_url(
         origin: str, destination: str, date: str, return_date: str = None
     ):
-        """Build Google Flights URL."""
+        """Build Google Flights URL from already-uppercased airport codes."""
+        q = f"Flights from {origin} to {destination} on {date}"
         if return_date:
-            return f"https://www.google.com/travel/flights?q=Flights%20from%20{origin.upper()}%20to%20{destination.upper()}%20on%20{date}%20returning%20{return_date}"
-        else:
-            return f"https://www.google.com/travel/flights?q=Flights%20from%20{origin.upper()}%20to%20{destination.upper()}%20on%20{date}"
+            q += f" returning {return_date}"
+        return _FLIGHTS_URL + quote_plus(q)
 
     async def capture_flight_screenshot(url: str):
         """Capture screenshot of Google Flights page."""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page(viewport={"width": 1200, "height": 800})
-            await page.set_extra_http_headers(
-                {
+        async with _SCREENSHOT_SEM:
+            browser = await get_browser()
+            context = await browser.new_context(
+                viewport={"width": 1200, "height": 800},
+                extra_http_headers={
                     "Accept-Language": "en-US,en;q=0.9",
                     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                }
+                },
             )
 
             try:
+                page = await context.new_page()
                 await page.goto(url, wait_until="networkidle", timeout=30000)
-                await page.wait_for_timeout(15000)
+                # Advance as soon as flight results render instead of a fixed sleep
+                try:
+                    await page.wait_for_selector(
+                        "[role='list'] [role='listitem']", timeout=15000
+                    )
+                    await page.wait_for_timeout(500)
+                except Exception:
+                    pass
                 screenshot = await page.screenshot(full_page=True)
-                screenshot_b64 = base64.b64encode(screenshot).decode()
 
                 return {
-                    "screenshot_base64": screenshot_b64,
+                    "screenshot_bytes": screenshot,
                     "url": url,
                     "success": True,
                 }
@@ -58,7 +98,7 @@ def register_flights_tool(app: FastMCP):
                     "success": False,
                 }
             finally:
-                await browser.close()
+                await context.close()
 
     @app.tool()
     async def search_flights(
@@ -82,43 +122,47 @@ def register_flights_tool(app: FastMCP):
                 "success": False,
             }
 
-        try:
-            datetime.strptime(departure_date, "%Y-%m-%d")
-            if return_date:
-                datetime.strptime(return_date, "%Y-%m-%d")
-        except ValueError:
+        if not (
+            _valid_date(departure_date)
+            and (not return_date or _valid_date(return_date))
+        ):
             return {"error": "Date must be in YYYY-MM-DD format", "success": False}
 
-        url = build_flight_url(origin, destination, departure_date, return_date)
+        o = origin.upper()
+        d = destination.upper()
+        url = build_flight_url(o, d, departure_date, return_date)
         screenshot_result = await capture_flight_screenshot(url)
-        screenshot_size = len(base64.b64decode(screenshot_result["screenshot_base64"]))
-        print(f"Screenshot size: {screenshot_size} bytes")
-        with open("debug_flight.png", "wb") as f:
-            f.write(base64.b64decode(screenshot_result["screenshot_base64"]))
-
         if not screenshot_result.get("success"):
             return screenshot_result
 
+        screenshot = screenshot_result["screenshot_bytes"]
+        if Config.DEBUG:
+            print(f"Screenshot size: {len(screenshot)} bytes")
+            with open("debug_flight.png", "wb") as f:
+                f.write(screenshot)
+
         try:
-            prompt = load_prompt("flight_analysis_prompt")
-            print(
-                f"Prompt loaded: {prompt[:100]}..."
-                if prompt
-                else "Prompt is None/empty"
-            )
+            prompt = _FLIGHT_PROMPT
+            if Config.DEBUG:
+                print(
+                    f"Prompt loaded: {prompt[:100]}..."
+                    if prompt
+                    else "Prompt is None/empty"
+                )
             analysis_result = await analyze_image_with_vision(
-                screenshot_result["screenshot_base64"], prompt
-            )
-            print(f"Analysis result keys: {analysis_result.keys()}")
-            print(
-                f"Analysis content: {analysis_result.get('analysis', 'NO ANALYSIS KEY')}"
+                base64.b64encode(screenshot).decode(), prompt
             )
+            if Config.DEBUG:
+                print(f"Analysis result keys: {analysis_result.keys()}")
+                print(
+                    f"Analysis content: {analysis_result.get('analysis', 'NO ANALYSIS KEY')}"
+                )
 
             return {
                 "success": True,
                 "url": url,
-                "origin": origin.upper(),
-                "destination": destination.upper(),
+                "origin": o,
+                "destination": d,
                 "departure_date": departure_date,
                 "return_date": return_date,
                 "trip_type": "round-trip" if return_date else "one-way",
@@ -148,21 +192,22 @@ def register_flights_tool(app: FastMCP):
             Screenshot of flexible date flight search
         """
 
-        try:
-            # Parse month/year and get first day of month
-            date_obj = datetime.strptime(f"{month_year}-01", "%Y-%m-%d")
-            first_day = date_obj.strftime("%Y-%m-%d")
-        except ValueError:
+        if not _valid_month(month_year):
             return {"error": "month_year must be in YYYY-MM format", "success": False}
+        first_day = f"{month_year}-01"
 
         url = f"https://www.google.com/travel/flights/search?tfs=CBwQAhopag0IAxIJL20vMDJfMjg2EgoyMDI1LTEwLTAxcgwIAxIIL20vMDY0eWo"
-        url = build_flight_url(origin, destination, first_day)
+        o = origin.upper()
+        d = destination.upper()
+        url = build_flight_url(o, d, first_day)
         result = await capture_flight_screenshot(url)
         if result.get("success"):
+            screenshot = result.pop("screenshot_bytes")
             result.update(
                 {
-                    "origin": origin.upper(),
-                    "destination": destination.upper(),
+                    "screenshot_base64": base64.b64encode(screenshot).decode(),
+                    "origin": o,
+                    "destination": d,
                     "month_year": month_year,
                     "search_type": "flexible_dates",
                     "note": "Showing results for first day of month - full flexible calendar requires complex URL encoding",
@@ -187,31 +232,35 @@ def register_flights_tool(app: FastMCP):
             return {"error": "Need at least 2 routes to compare", "success": False}
 
         results = {}
+        tasks = {}
 
         for i, route in enumerate(routes):
-            try:
-                origin = route.get("origin")
-                destination = route.get("destination")
-                date = route.get("date")
-
-                if not all([origin, destination, date]):
-                    results[f"route_{i+1}"] = {
-                        "error": "Missing required fields: origin, destination, date",
-                        "success": False,
-                    }
-                    continue
-
-                # Search this route
-                route_result = await search_flights(
-                    origin, destination, date, route.get("return_date")
-                )
-                results[f"route_{i+1}"] = route_result
+            origin = route.get("origin")
+            destination = route.get("destination")
+            date = route.get("date")
 
-            except Exception as e:
+            if not all([origin, destination, date]):
                 results[f"route_{i+1}"] = {
-                    "error": f"Failed to search route: {str(e)}",
+                    "error": "Missing required fields: origin, destination, date",
+                    "success": False,
+                }
+                continue
+
+            # Reserve the slot so results keep the original route order
+            results[f"route_{i+1}"] = None
+            tasks[f"route_{i+1}"] = search_flights(
+                origin, destination, date, route.get("return_date")
+            )
+
+        # Search all valid routes concurrently
+        route_results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for key, route_result in zip(tasks, route_results):
+            if isinstance(route_result, Exception):
+                route_result = {
+                    "error": f"Failed to search route: {str(route_result)}",
                     "success": False,
                 }
+            results[key] = route_result
 
         successful_searches = sum(1 for r in results.values() if r.get("success"))
         return {
@@ -238,14 +287,17 @@ def register_flights_tool(app: FastMCP):
 
         # Use natural language query format for Google Flights
         # This is more reliable than complex encoded URLs
-        url = f"https://www.google.com/travel/flights?q=Flights from {origin} under ${budget_max}"
+        o = origin.upper()
+        url = _FLIGHTS_URL + quote_plus(f"Flights from {o} under ${budget_max}")
 
         result = await capture_flight_screenshot(url)
 
         if result.get("success"):
+            screenshot = result.pop("screenshot_bytes")
             result.update(
                 {
-                    "origin": origin.upper(),
+                    "screenshot_base64": base64.b64encode(screenshot).decode(),
+                    "origin": o,
                     "budget_max": budget_max,
                     "search_type": "deals_explore",
                     "note": "Explore page - manual destination selection may be needed",
@@ -6,7 +6,7 @@ Provides place name to coordinates conversion.
 
 from mcp.server.fastmcp import FastMCP
 
-from utils.geo_utils import geocode_place
+from utils.geo_utils import geocode_place, geocode_places
 
 
 def register_geocoding_tool(app: FastMCP):
@@ -17,3 +17,12 @@ def register_geocoding_tool(app: FastMCP):
         """Geocode a place name to get coordinates and location information."""
         result = await geocode_place(name)
         return result or {"error": f"could not geocode '{name}'"}
+
+    @app.tool()
+    async def geocode_places_tool(names: list):
+        """Geocode several place names at once, returned in the same order."""
+        results = await geocode_places(names)
+        return [
+            result or {"error": f"could not geocode '{name}'"}
+            for name, result in zip(names, results)
+        ]
@@ -4,17 +4,93 @@ Hotels tool for the travel agent.
 Provides hotel search and screenshot capture functionality.
 """
 import asyncio
-import base64
+import hashlib
 import os
 import tempfile
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import quote
 
 from mcp.server.fastmcp import FastMCP
-from playwright.async_api import async_playwright
 
+from config import Config
+from utils import json_utils
+from utils.browser import (
+    block_heavy_resources,
+    get_browser,
+    wait_for_network_quiet,
+)
+from utils.image_utils import prepare_screenshot
 from utils.openai_client import analyze_image_with_vision, has_openai_client
 from utils.prompt_loader import load_prompt
 
+# Prompts are static for the lifetime of the process
+_HOTEL_PROMPT = load_prompt("hotel_analysis_prompt")
+
+# Successful search_hotels results are cached on disk next to the memory store
+_HOTELS_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "memory", "hotels_cache"
+)
+_HOTELS_CACHE_TTL = 600
+
+# Vision results keyed by screenshot digest, so query variants that render
+# the same page share one analysis: digest -> (stored_at, analysis_result)
+_VISION_CACHE = {}
+_VISION_CACHE_TTL = 600
+
+# Cap concurrent browser contexts when several searches run at once
+_SCREENSHOT_SEM = asyncio.Semaphore(Config.HOTEL_PARALLELISM)
+
+
+def _hotels_cache_path(destination, checkin_date, checkout_date, guests, rooms):
+    """Get the cache file path for a normalized hotel query."""
+    key = (destination.lower().strip(), checkin_date, checkout_date, guests, rooms)
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return os.path.join(_HOTELS_CACHE_DIR, f"{digest}.json")
+
+
+def _read_cached_hotels(cache_file):
+    """Return a cached result if it exists and is younger than the TTL."""
+    try:
+        if time.time() - os.path.getmtime(cache_file) >= _HOTELS_CACHE_TTL:
+            return None
+        with open(cache_file, "rb") as f:
+            return json_utils.loads(f.read())
+    except (OSError, json_utils.JSONDecodeError):
+        return None
+
+
+def _write_cached_hotels(cache_file, result):
+    """Store a successful result in the cache, ignoring write errors."""
+    try:
+        os.makedirs(_HOTELS_CACHE_DIR, exist_ok=True)
+        with open(cache_file, "w") as f:
+            f.write(json_utils.dumps(result))
+    except OSError:
+        pass
+
+
+async def _analyze_hotel_screenshot(screenshot):
+    """Run vision analysis, reusing a recent result for an identical screenshot."""
+    digest = hashlib.blake2b(screenshot, digest_size=16).hexdigest()
+    now = time.monotonic()
+    cached = _VISION_CACHE.get(digest)
+    if cached is not None and now - cached[0] < _VISION_CACHE_TTL:
+        return cached[1]
+
+    analysis_result = await analyze_image_with_vision(
+        screenshot, _HOTEL_PROMPT, image_format="jpeg", detail="low"
+    )
+    if analysis_result.get("success"):
+        # Drop expired entries so the cache doesn't grow without bound
+        expired = [
+            k for k, (t, _) in _VISION_CACHE.items() if now - t >= _VISION_CACHE_TTL
+        ]
+        for key in expired:
+            del _VISION_CACHE[key]
+        _VISION_CACHE[digest] = (now, analysis_result)
+    return analysis_result
+
 
 def register_hotels_tool(app: FastMCP):
     """Register the Hotels tool with the FastMCP app."""
@@ -29,8 +105,6 @@ def register_hotels_tool(app: FastMCP):
         """Build Google Hotels URL with language parameter to ensure consistency."""
         base_url = "https://www.google.com/travel/hotels"
         # URL-encode the destination to handle spaces and special characters
-        from urllib.parse import quote
-
         encoded_destination = quote(destination)
 
         # Construct the query string with all parameters
@@ -45,25 +119,35 @@ def register_hotels_tool(app: FastMCP):
 
     async def capture_hotel_screenshot(url: str):
         """Capture screenshot of Google Hotels page."""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page(viewport={"width": 1200, "height": 800})
-
+        async with _SCREENSHOT_SEM:
+            browser = await get_browser()
             # Set realistic headers
-            await page.set_extra_http_headers(
-                {
+            context = await browser.new_context(
+                viewport={"width": 1200, "height": 800},
+                extra_http_headers={
                     "Accept-Language": "en-US,en;q=0.9",
                     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                }
+                },
             )
 
             try:
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                await page.wait_for_timeout(6000)
+                # Analysis reads prices and names, so thumbnails and map tiles can go
+                await block_heavy_resources(context)
+                page = await context.new_page()
+                await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+                # Google Hotels keeps polling in the background, so networkidle is
+                # slow to fire; wait for rendered results and a quiet network instead
+                try:
+                    await page.wait_for_selector("c-wiz[jsrenderer]", timeout=8000)
+                except Exception:
+                    pass
+                await wait_for_network_quiet(page, idle=1.5, cap=8.0)
                 screenshot = await page.screenshot(full_page=True)
-                screenshot_b64 = base64.b64encode(screenshot).decode()
+                # Listings fit in the top of the page; fewer pixels = fewer vision
+                # tokens. Image work is CPU-bound, so keep it off the event loop
+                screenshot = await asyncio.to_thread(prepare_screenshot, screenshot)
                 return {
-                    "screenshot_base64": screenshot_b64,
+                    "screenshot_bytes": screenshot,
                     "url": url,
                     "success": True,
                 }
@@ -73,7 +157,7 @@ def register_hotels_tool(app: FastMCP):
                     "success": False,
                 }
             finally:
-                await browser.close()
+                await context.close()
 
     @app.tool()
     async def search_hotels(
@@ -104,8 +188,8 @@ def register_hotels_tool(app: FastMCP):
             }
 
         try:
-            checkin = datetime.strptime(checkin_date, "%Y-%m-%d")
-            checkout = datetime.strptime(checkout_date, "%Y-%m-%d")
+            checkin = date.fromisoformat(checkin_date)
+            checkout = date.fromisoformat(checkout_date)
 
             if checkout <= checkin:
                 return {
@@ -116,6 +200,13 @@ def register_hotels_tool(app: FastMCP):
         except ValueError:
             return {"error": "Dates must be in YYYY-MM-DD format", "success": False}
 
+        cache_file = _hotels_cache_path(
+            destination, checkin_date, checkout_date, guests, rooms
+        )
+        cached = _read_cached_hotels(cache_file)
+        if cached is not None:
+            return {**cached, "cached": True}
+
         nights = (checkout - checkin).days
         url = build_hotel_url(destination, checkin_date, checkout_date, guests, rooms)
         screenshot_result = await capture_hotel_screenshot(url)
@@ -124,12 +215,11 @@ def register_hotels_tool(app: FastMCP):
             return screenshot_result
 
         try:
-            prompt = load_prompt("hotel_analysis_prompt")
-            analysis_result = await analyze_image_with_vision(
-                screenshot_result["screenshot_base64"], prompt
+            analysis_result = await _analyze_hotel_screenshot(
+                screenshot_result["screenshot_bytes"]
             )
 
-            return {
+            result = {
                 "success": True,
                 "url": url,
                 "destination": destination,
@@ -142,6 +232,10 @@ def register_hotels_tool(app: FastMCP):
                 "model_used": analysis_result.get("model", ""),
                 "timestamp": datetime.now().isoformat(),
             }
+            # Failed vision calls are not cached
+            if analysis_result.get("success"):
+                _write_cached_hotels(cache_file, result)
+            return result
 
         except Exception as e:
             return {
@@ -252,20 +346,22 @@ def register_hotels_tool(app: FastMCP):
 
         results = {}
 
-        for i, area in enumerate(areas):
-            try:
-                area_destination = f"{destination} {area}"
-                area_result = await search_hotels(
-                    area_destination, checkin_date, checkout_date
-                )
-                if area_result.get("success"):
-                    area_result["area"] = area
-                results[f"area_{i+1}_{area.replace(' ', '_').lower()}"] = area_result
-            except Exception as e:
-                results[f"area_{i+1}_{area.replace(' ', '_').lower()}"] = {
-                    "error": f"Failed to search area {area}: {str(e)}",
+        # Search all areas concurrently; one failing area doesn't cancel the rest
+        tasks = [
+            search_hotels(f"{destination} {area}", checkin_date, checkout_date)
+            for area in areas
+        ]
+        gathered = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for i, (area, area_result) in enumerate(zip(areas, gathered)):
+            if isinstance(area_result, Exception):
+                area_result = {
+                    "error": f"Failed to search area {area}: {str(area_result)}",
                     "success": False,
                 }
+            elif area_result.get("success"):
+                area_result["area"] = area
+            results[f"area_{i+1}_{area.replace(' ', '_').lower()}"] = area_result
 
         successful_searches = sum(1 for r in results.values() if r.get("success"))
         return {
@@ -329,9 +425,9 @@ def register_hotels_tool(app: FastMCP):
         """
 
         try:
-            checkin = datetime.strptime(checkin_date, "%Y-%m-%d")
+            checkin = date.fromisoformat(checkin_date)
             checkout = checkin + timedelta(days=nights)
-            checkout_date = checkout.strftime("%Y-%m-%d")
+            checkout_date = checkout.isoformat()
         except ValueError:
             return {
                 "error": "checkin_date must be in YYYY-MM-DD format",
@@ -4,94 +4,187 @@ Memory tool for the travel agent MCP server.
 Provides persistent memory storage and retrieval for travel preferences and context.
 """
 
-import json
 import os
+import re
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
 from config import Config
+from utils import json_utils
 
+_MEMORY_DIR = Path(__file__).resolve().parent.parent / "memory"
+_MEMORY_DIR.mkdir(parents=True, exist_ok=True)
 
-def register_memory_tool(app: FastMCP):
-    """Register the memory tool with the FastMCP app."""
+# Index of memory key -> {"timestamp", "preview"} kept next to the entries
+_INDEX_FILE = "_index.json"
+_INDEX_PATH = _MEMORY_DIR / _INDEX_FILE
+# Serializes index updates when the tools run in worker threads
+_INDEX_LOCK = threading.Lock()
 
-    memory_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "memory")
-    os.makedirs(memory_dir, exist_ok=True)
+# Keys map straight to file names, so anything that could escape the
+# memory directory is rejected; a leading "_" is reserved for internal
+# files such as the index
+_KEY_RE = re.compile(r"[A-Za-z0-9\-][A-Za-z0-9_\-]*")
 
-    @app.tool()
-    def store_travel_memory(key, data):
-        """Store travel information in memory with a key."""
-        memory_file = os.path.join(memory_dir, f"{key}.json")
-        memory_entry = {"timestamp": datetime.now().isoformat(), "data": data}
+# Messages mentioning any of these are kept as key points when compressing
+_KEYWORDS_RE = re.compile(
+    r"\b(?:destination|hotel|flight|budget|prefer)", re.IGNORECASE
+)
 
-        try:
-            with open(memory_file, "w") as f:
-                json.dump(memory_entry, f, indent=2)
 
-            return {
-                "success": True,
-                "message": f"Stored memory with key: {key}",
+def _preview(data):
+    """Short string preview of stored memory data."""
+    text = str(data)
+    return text[:100] + "..." if len(text) > 100 else text
+
+
+def _load_index():
+    """Load the memory index, or an empty one if missing or unreadable."""
+    try:
+        with open(_INDEX_PATH, "rb") as f:
+            return json_utils.loads(f.read())
+    except (OSError, json_utils.JSONDecodeError):
+        return {}
+
+
+def _save_index(index):
+    """Atomically replace the memory index."""
+    tmp_file = _INDEX_PATH.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        f.write(json_utils.dumps(index))
+    os.replace(tmp_file, _INDEX_PATH)
+
+
+def store_travel_memory(key, data):
+    """Store travel information in memory with a key."""
+    if not _KEY_RE.fullmatch(str(key)):
+        return {"success": False, "error": f"Invalid memory key: {key}"}
+    memory_file = _MEMORY_DIR / f"{key}.json"
+    memory_entry = {"timestamp": datetime.now().isoformat(), "data": data}
+
+    try:
+        with open(memory_file, "w") as f:
+            f.write(json_utils.dumps(memory_entry, indent=True))
+
+        with _INDEX_LOCK:
+            index = _load_index()
+            index[key] = {
                 "timestamp": memory_entry["timestamp"],
+                "preview": _preview(data),
             }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            _save_index(index)
 
-    @app.tool()
-    def retrieve_travel_memory(key):
-        """Retrieve travel information from memory."""
-        memory_file = os.path.join(memory_dir, f"{key}.json")
+        return {
+            "success": True,
+            "message": f"Stored memory with key: {key}",
+            "timestamp": memory_entry["timestamp"],
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
-        try:
-            if not os.path.exists(memory_file):
-                return {"success": False, "error": f"No memory found for key: {key}"}
 
-            with open(memory_file, "r") as f:
-                memory_entry = json.load(f)
+def retrieve_travel_memory(key):
+    """Retrieve travel information from memory."""
+    if not _KEY_RE.fullmatch(str(key)):
+        return {"success": False, "error": f"Invalid memory key: {key}"}
+    memory_file = _MEMORY_DIR / f"{key}.json"
 
-            return {
-                "success": True,
-                "key": key,
-                "data": memory_entry["data"],
+    try:
+        if not memory_file.exists():
+            return {"success": False, "error": f"No memory found for key: {key}"}
+
+        with open(memory_file, "rb") as f:
+            memory_entry = json_utils.loads(f.read())
+
+        return {
+            "success": True,
+            "key": key,
+            "data": memory_entry["data"],
+            "timestamp": memory_entry["timestamp"],
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def _sync_index():
+    """Bring the index in line with the entries on disk. Needs _INDEX_LOCK."""
+    index = _load_index()
+    keys = {
+        entry.name[:-5]  # Remove .json extension
+        for entry in os.scandir(_MEMORY_DIR)
+        if entry.name.endswith(".json") and entry.name != _INDEX_FILE
+    }
+
+    # Only read entries the index doesn't know about yet
+    changed = False
+    for key in keys - index.keys():
+        try:
+            with open(_MEMORY_DIR / f"{key}.json", "rb") as f:
+                memory_entry = json_utils.loads(f.read())
+            index[key] = {
                 "timestamp": memory_entry["timestamp"],
+                "preview": _preview(memory_entry["data"]),
             }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            changed = True
+        except:
+            continue
+    for key in index.keys() - keys:
+        del index[key]
+        changed = True
+    if changed:
+        _save_index(index)
+    return index
+
+
+def list_travel_memories():
+    """List all available memory keys and their timestamps."""
+    try:
+        with _INDEX_LOCK:
+            index = _sync_index()
+
+        memories = [{"key": key, **entry} for key, entry in index.items()]
+        memories.sort(key=lambda x: x["timestamp"], reverse=True)
+        return memories
+
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+def batch_travel_memory(store=None, list_limit=None):
+    """
+    Store several memories and/or list recent ones in a single call.
+
+    Args:
+        store: List of {"key": ..., "data": ...} entries to store
+        list_limit: If set, also return up to this many most recent memories
+
+    Returns:
+        Dictionary with per-entry store results and, if requested, memories
+    """
+    result = {
+        "stored": [
+            store_travel_memory(entry.get("key"), entry.get("data"))
+            for entry in store or []
+        ]
+    }
+    if list_limit is not None:
+        result["memories"] = list_travel_memories()[: int(list_limit)]
+    return result
 
-    @app.tool()
-    def list_travel_memories():
-        """List all available memory keys and their timestamps."""
-        try:
-            memories = []
-            for filename in os.listdir(memory_dir):
-                if filename.endswith(".json"):
-                    key = filename[:-5]  # Remove .json extension
-                    memory_file = os.path.join(memory_dir, filename)
-
-                    try:
-                        with open(memory_file, "r") as f:
-                            memory_entry = json.load(f)
-
-                        memories.append(
-                            {
-                                "key": key,
-                                "timestamp": memory_entry["timestamp"],
-                                "preview": (
-                                    str(memory_entry["data"])[:100] + "..."
-                                    if len(str(memory_entry["data"])) > 100
-                                    else str(memory_entry["data"])
-                                ),
-                            }
-                        )
-                    except:
-                        continue
-
-            memories.sort(key=lambda x: x["timestamp"], reverse=True)
-            return memories
 
-        except Exception as e:
-            return [{"error": str(e)}]
+def register_memory_tool(app: FastMCP):
+    """Register the memory tool with the FastMCP app."""
+
+    for tool in (
+        store_travel_memory,
+        retrieve_travel_memory,
+        list_travel_memories,
+        batch_travel_memory,
+    ):
+        app.tool()(tool)
 
     @app.tool()
     def load_travel_context():
@@ -135,28 +228,20 @@ def register_memory_tool(app: FastMCP):
 
         # Simple compression - keep first 2 and last 5 messages, summarize middle
         if len(messages) > 15:
+            now = datetime.now()
             summary = {
-                "conversation_id": f"compressed_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                "conversation_id": f"compressed_{now.strftime('%Y%m%d_%H%M%S')}",
                 "original_length": len(messages),
                 "summary": f"Conversation with {len(messages)} messages about travel planning",
                 "key_points": [],
-                "compressed_at": datetime.now().isoformat(),
+                "compressed_at": now.isoformat(),
             }
 
             # Extract key points from middle messages
             middle_messages = messages[2:-5]
             for msg in middle_messages:
                 content = str(msg.get("content", ""))
-                if any(
-                    keyword in content.lower()
-                    for keyword in [
-                        "destination",
-                        "hotel",
-                        "flight",
-                        "budget",
-                        "prefer",
-                    ]
-                ):
+                if _KEYWORDS_RE.search(content):
                     summary["key_points"].append(content[:200])
 
             # Store compressed summary
@@ -5,12 +5,142 @@ Provides step-by-step reasoning and planning capabilities.
 """
 
 import json
+import os
+import re
 from datetime import datetime
 
 from mcp.server.fastmcp import FastMCP
 
+from utils import json_utils
+
+# Thought logs are trimmed to the newest half once they exceed MAX_THOUGHTS
+MAX_THOUGHTS = 2000
+MAX_BRANCHES = 100
+
+_MEMORY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "memory")
+
+# Steps for travel objectives; create_plan hands out copies
+_TRAVEL_PLAN_TEMPLATE = (
+    {
+        "step": 1,
+        "action": "Assess information completeness",
+        "description": "Check if we have enough details (origin, dates, travelers, preferences) or need to ask clarifying questions",
+        "tools_needed": ["think"],
+        "parallel": False,
+    },
+    {
+        "step": 2,
+        "action": "Get current date and parse travel dates",
+        "description": "Determine today's date and convert relative dates to specific dates",
+        "tools_needed": ["get_current_date", "parse_travel_dates"],
+        "parallel": False,
+    },
+    {
+        "step": 3,
+        "action": "Gather core travel information",
+        "description": "Search flights and hotels with available information",
+        "tools_needed": ["search_flights", "search_hotels"],
+        "parallel": True,
+    },
+    {
+        "step": 4,
+        "action": "Enhance with destination context",
+        "description": "Get weather, cultural info, and practical details",
+        "tools_needed": [
+            "get_weather",
+            "search_wikipedia",
+            "convert_currency",
+        ],
+        "parallel": True,
+    },
+    {
+        "step": 5,
+        "action": "Create comprehensive itinerary",
+        "description": "Synthesize all information into detailed travel plan",
+        "tools_needed": ["think"],
+        "parallel": False,
+    },
+)
+
+_TRAVEL_RE = re.compile(r"travel|trip", re.IGNORECASE)
+
+
+def _archive_thoughts(thoughts):
+    """Save evicted thoughts as a memory entry retrievable by key."""
+    now = datetime.now()
+    key = f"thoughts_archive_{now.strftime('%Y%m%d_%H%M%S_%f')}"
+    try:
+        os.makedirs(_MEMORY_DIR, exist_ok=True)
+        with open(os.path.join(_MEMORY_DIR, f"{key}.json"), "w") as f:
+            f.write(
+                json_utils.dumps(
+                    {"timestamp": now.isoformat(), "data": thoughts}, indent=True
+                )
+            )
+    except OSError:
+        pass
+
+
+class ThoughtLog:
+    """Ordered list of thoughts indexed by thoughtNumber for O(1) lookups."""
+
+    def __init__(self, thoughts=None):
+        self.thoughts = list(thoughts or [])
+        self._reindex()
+
+    def _reindex(self):
+        self.index = {}
+        for i, t in enumerate(self.thoughts):
+            self.index.setdefault(t["thoughtNumber"], i)
+
+    def __len__(self):
+        return len(self.thoughts)
+
+    def append(self, thought):
+        """Add a thought to the end of the log."""
+        self.index.setdefault(thought["thoughtNumber"], len(self.thoughts))
+        self.thoughts.append(thought)
+        if len(self.thoughts) > MAX_THOUGHTS:
+            keep = MAX_THOUGHTS // 2
+            _archive_thoughts(self.thoughts[:-keep])
+            self.thoughts = self.thoughts[-keep:]
+            self._reindex()
+
+    def revise(self, thought_number, thought):
+        """Replace an earlier thought in place; no-op if it isn't in the log."""
+        pos = self.index.get(thought_number)
+        if pos is None:
+            return
+        self.thoughts[pos] = thought
+        new_number = thought["thoughtNumber"]
+        if new_number == thought_number:
+            return
+        if self.index.get(new_number, pos + 1) > pos:
+            self.index[new_number] = pos
+        # The old number now points at the next thought still using it, if any
+        later = next(
+            (
+                i
+                for i in range(pos + 1, len(self.thoughts))
+                if self.thoughts[i]["thoughtNumber"] == thought_number
+            ),
+            None,
+        )
+        if later is None:
+            del self.index[thought_number]
+        else:
+            self.index[thought_number] = later
+
+    def fork(self, thought_number):
+        """Copy of the log up to and including thought_number (empty if missing)."""
+        pos = self.index.get(thought_number)
+        if pos is None:
+            return ThoughtLog()
+        return ThoughtLog(self.thoughts[: pos + 1])
+
+
 # Store thought history
-thought_history = []
+thought_history = ThoughtLog()
 thought_branches = {}
 
 
@@ -56,50 +186,20 @@ def register_sequential_thinking_tool(app: FastMCP):
             "timestamp": datetime.now().isoformat(),
         }
         if branchId:
-            if branchFromThought:
-                if branchId not in thought_branches:
-                    branch_from_index = next(
-                        (
-                            i
-                            for i, t in enumerate(thought_history)
-                            if t["thoughtNumber"] == branchFromThought
-                        ),
-                        None,
-                    )
-
-                    if branch_from_index is not None:
-                        thought_branches[branchId] = thought_history[
-                            : branch_from_index + 1
-                        ].copy()
-                    else:
-                        thought_branches[branchId] = []
+            if branchFromThought and branchId not in thought_branches:
+                if len(thought_branches) >= MAX_BRANCHES:
+                    # Drop the oldest branch (dicts keep insertion order)
+                    del thought_branches[next(iter(thought_branches))]
+                thought_branches[branchId] = thought_history.fork(branchFromThought)
 
             if branchId in thought_branches:
                 if isRevision and revisesThought:
-                    revise_index = next(
-                        (
-                            i
-                            for i, t in enumerate(thought_branches[branchId])
-                            if t["thoughtNumber"] == revisesThought
-                        ),
-                        None,
-                    )
-                    if revise_index is not None:
-                        thought_branches[branchId][revise_index] = thought_data
+                    thought_branches[branchId].revise(revisesThought, thought_data)
                 else:
                     thought_branches[branchId].append(thought_data)
         else:
             if isRevision and revisesThought:
-                revise_index = next(
-                    (
-                        i
-                        for i, t in enumerate(thought_history)
-                        if t["thoughtNumber"] == revisesThought
-                    ),
-                    None,
-                )
-                if revise_index is not None:
-                    thought_history[revise_index] = thought_data
+                thought_history.revise(revisesThought, thought_data)
             else:
                 thought_history.append(thought_data)
 
@@ -154,47 +254,11 @@ def register_sequential_thinking_tool(app: FastMCP):
         if available_tools is None:
             available_tools = []
 
-        if "travel" in objective.lower() or "trip" in objective.lower():
+        if _TRAVEL_RE.search(objective):
+            # Copy down to the tool lists so callers can mutate their plan
             plan_steps = [
-                {
-                    "step": 1,
-                    "action": "Assess information completeness",
-                    "description": "Check if we have enough details (origin, dates, travelers, preferences) or need to ask clarifying questions",
-                    "tools_needed": ["think"],
-                    "parallel": False,
-                },
-                {
-                    "step": 2,
-                    "action": "Get current date and parse travel dates",
-                    "description": "Determine today's date and convert relative dates to specific dates",
-                    "tools_needed": ["get_current_date", "parse_travel_dates"],
-                    "parallel": False,
-                },
-                {
-                    "step": 3,
-                    "action": "Gather core travel information",
-                    "description": "Search flights and hotels with available information",
-                    "tools_needed": ["search_flights", "search_hotels"],
-                    "parallel": True,
-                },
-                {
-                    "step": 4,
-                    "action": "Enhance with destination context",
-                    "description": "Get weather, cultural info, and practical details",
-                    "tools_needed": [
-                        "get_weather",
-                        "search_wikipedia",
-                        "convert_currency",
-                    ],
-                    "parallel": True,
-                },
-                {
-                    "step": 5,
-                    "action": "Create comprehensive itinerary",
-                    "description": "Synthesize all information into detailed travel plan",
-                    "tools_needed": ["think"],
-                    "parallel": False,
-                },
+                {**step, "tools_needed": list(step["tools_needed"])}
+                for step in _TRAVEL_PLAN_TEMPLATE
             ]
         else:
             plan_steps = [
@@ -240,14 +304,16 @@ def register_sequential_thinking_tool(app: FastMCP):
         if current_info is None:
             current_info = {}
 
-        total_steps = len(plan.get("plan", []))
+        steps = plan.get("plan", [])
+        total_steps = len(steps)
         completed_count = len(completed_steps)
         progress_percentage = (
             (completed_count / total_steps) * 100 if total_steps > 0 else 0
         )
+        completed = set(completed_steps)
         next_steps = []
-        for step in plan.get("plan", []):
-            if step["step"] not in completed_steps:
+        for step in steps:
+            if step["step"] not in completed:
                 next_steps.append(step)
                 if not step.get("parallel", False):
                     break
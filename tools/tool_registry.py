@@ -4,8 +4,8 @@ Tool registry for the travel agent MCP server.
 Centralizes tool registration and management.
 """
 
-from fastmcp.client import Client
-from fastmcp.client.transports import StreamableHttpTransport
+import asyncio
+
 from mcp.server.fastmcp import FastMCP
 
 from config import Config
@@ -20,37 +20,84 @@ from tools.travel_advice import register_ai_tools
 from tools.weather import register_weather_tool
 from tools.web_search import register_web_search_tool
 from tools.wikipedia import register_wikipedia_tool
+from utils.mcp_pool import get_mcp_pool
 
 from .flights import register_flights_tool
 from .hotels import register_hotels_tool
 
 
-def register_all_tools(app: FastMCP):
-    """Register all travel agent tools with the FastMCP app."""
+# Limits for batch_execute fan-out
+_BATCH_MAX_CONCURRENT = 8
+_BATCH_CALL_TIMEOUT = 60.0
 
+# Tool registrars in registration order
+_TOOL_REGISTRARS = (
     # Essential core tools
-    register_web_search_tool(app)  # Basic web search
-    register_geocoding_tool(app)  # Location resolution
-    register_weather_tool(app)  # Weather info
-    register_wikipedia_tool(app)  # Destination information
-    register_currency_tool(app)  # Currency conversion
-    register_date_tool(app)  # Date/time utilities
-    register_airport_tools(app)  # Airport codes/info
-
+    register_web_search_tool,  # Basic web search
+    register_geocoding_tool,  # Location resolution
+    register_weather_tool,  # Weather info
+    register_wikipedia_tool,  # Destination information
+    register_currency_tool,  # Currency conversion
+    register_date_tool,  # Date/time utilities
+    register_airport_tools,  # Airport codes/info
     # Main travel search tools (screenshot + vision)
-    register_flights_tool(app)
-    register_hotels_tool(app)
-
+    register_flights_tool,
+    register_hotels_tool,
     # Local transport
-    register_transit_tools(app)
-
+    register_transit_tools,
     # AI and memory tools
-    register_ai_tools(app)
-    register_memory_tool(app)
-    register_sequential_thinking_tool(app)
+    register_ai_tools,
+    register_memory_tool,
+    register_sequential_thinking_tool,
+)
+
+
+def register_all_tools(app: FastMCP):
+    """Register all travel agent tools with the FastMCP app."""
+    for register in _TOOL_REGISTRARS:
+        register(app)
 
     # Enhanced tools
     register_enhanced_tools(app)
+    register_tool_index(app)
+
+
+def _tool_manager(app: FastMCP):
+    """FastMCP's private tool manager for the app.
+
+    batch_execute needs each tool's raw return value, and the public
+    FastMCP.call_tool converts it to MCP content blocks. The private access
+    lives here only, so a FastMCP upgrade has one place to fix.
+    """
+    return app._tool_manager
+
+
+def register_tool_index(app: FastMCP):
+    """Register lightweight tools for browsing tool schemas on demand."""
+
+    @app.tool()
+    async def list_available_tools():
+        """List every tool by name with a one-line summary."""
+        return [
+            {
+                "name": tool.name,
+                "summary": (tool.description or "").strip().split("\n", 1)[0],
+            }
+            for tool in await app.list_tools()
+        ]
+
+    @app.tool()
+    async def get_tool_schema(name):
+        """Get the full description and parameter schema of a tool by name."""
+        for tool in await app.list_tools():
+            if tool.name == name:
+                return {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": tool.inputSchema,
+                    "success": True,
+                }
+        return {"error": f"Unknown tool: {name}", "success": False}
 
 
 def register_enhanced_tools(app: FastMCP):
@@ -137,6 +184,44 @@ def register_enhanced_tools(app: FastMCP):
             "note": "Full MCP tool discovery requires async initialization",
         }
 
+    @app.tool()
+    async def batch_execute(calls: list, timeout: float = _BATCH_CALL_TIMEOUT):
+        """
+        Run several independent tool calls concurrently in one request.
+
+        Args:
+            calls: List of {"tool": name, "args": {...}} invocations
+            timeout: Per-call timeout in seconds (default: 60)
+
+        Returns:
+            Dictionary with one result per call, in the same order
+        """
+        sem = asyncio.Semaphore(_BATCH_MAX_CONCURRENT)
+
+        async def _run(call):
+            name = call.get("tool")
+            if name == "batch_execute":
+                return {"error": "batch_execute cannot be nested", "success": False}
+            async with sem:
+                return await asyncio.wait_for(
+                    _tool_manager(app).call_tool(name, call.get("args") or {}),
+                    timeout,
+                )
+
+        gathered = await asyncio.gather(
+            *(_run(call) for call in calls), return_exceptions=True
+        )
+
+        results = []
+        for call, result in zip(calls, gathered):
+            if isinstance(result, asyncio.TimeoutError):
+                result = {"error": f"Timed out after {timeout}s", "success": False}
+            elif isinstance(result, Exception):
+                result = {"error": str(result), "success": False}
+            results.append({"tool": call.get("tool"), "result": result})
+
+        return {"results": results, "total_calls": len(calls)}
+
     @app.tool()
     def manage_workspace_config(action="get", updates=None):
         """Manage workspace configuration."""
@@ -149,6 +234,16 @@ def register_enhanced_tools(app: FastMCP):
 
         elif action == "update" and updates:
             current_config = Config.get_workspace_config()
+            if all(
+                k in current_config and current_config[k] == v
+                for k, v in updates.items()
+            ):
+                # Nothing would change; skip the disk write
+                return {
+                    "success": True,
+                    "message": "Workspace configuration unchanged",
+                    "updated_config": current_config,
+                }
             current_config.update(updates)
             Config.save_workspace_config(current_config)
 
@@ -161,34 +256,39 @@ def register_enhanced_tools(app: FastMCP):
         return {"error": "Invalid action or missing updates parameter"}
 
 
+async def _discover_one(server_name, url):
+    """List the tools exposed by a single HTTP MCP server."""
+    pool = get_mcp_pool()
+    try:
+        async with pool.session(f"{url}/mcp") as client:
+            tools = await client.list_tools()
+        return server_name, [
+            {
+                "name": tool.name,
+                "description": tool.description or "",
+                "server": server_name,
+            }
+            for tool in tools
+        ]
+    except Exception as e:
+        # Don't keep a session that may be broken
+        await pool.discard(f"{url}/mcp")
+        print(f"Warning: Could not discover tools from {server_name}: {e}")
+        return server_name, {"error": str(e)}
+
+
 async def discover_mcp_tools_async():
     """Async MCP tool discovery for server initialization."""
     mcp_servers = Config.get_mcp_servers()
-    discovered_tools = {}
-
-    for server_name, server_config in mcp_servers.items():
-        if not server_config.get("enabled", True):
-            continue
-
-        if server_config.get("transport") == "http":
-            url = server_config.get("url")
-            if not url:
-                continue
-
-            try:
-                transport = StreamableHttpTransport(url=f"{url}/mcp")
-                async with Client(transport) as client:
-                    tools = await client.list_tools()
-                    discovered_tools[server_name] = [
-                        {
-                            "name": tool.name,
-                            "description": tool.description or "",
-                            "server": server_name,
-                        }
-                        for tool in tools
-                    ]
-            except Exception as e:
-                print(f"Warning: Could not discover tools from {server_name}: {e}")
-                discovered_tools[server_name] = {"error": str(e)}
 
-    return discovered_tools
+    # Query every enabled HTTP server concurrently
+    tasks = [
+        _discover_one(server_name, server_config["url"])
+        for server_name, server_config in mcp_servers.items()
+        if server_config.get("enabled", True)
+        and server_config.get("transport") == "http"
+        and server_config.get("url")
+    ]
+    results = await asyncio.gather(*tasks)
+
+    return dict(results)
@@ -4,12 +4,44 @@ Transit and routing tools for the travel agent.
 Provides public transport and routing functionality.
 """
 
+import asyncio
+import time
+
 from dateutil import parser as dateparser
-from duckduckgo_search import DDGS
 from mcp.server.fastmcp import FastMCP
 
+from utils import json_utils
 from utils.geo_utils import geocode_place, parse_latlon
 from utils.http_client import get_http_client
+from utils.search_utils import ddg_text_search
+
+_OSRM_BASE = "https://router.project-osrm.org"
+_OSRM_PROFILES = {"driving": "driving", "walking": "walking", "cycling": "cycling"}
+_OSRM_ROUTE_PARAMS = {"overview": "false", "alternatives": "false", "steps": "false"}
+_OSRM_TABLE_PARAMS = {"annotations": "duration,distance"}
+
+# Shaped DuckDuckGo results keyed by (query, max_results) -> (stored_at, items)
+_ddg_cache = {}
+_DDG_CACHE_TTL = 600
+_DDG_CACHE_MAX = 512
+
+
+async def _ddg_search(query, max_results):
+    """Run a DuckDuckGo text search, reusing results from the last 10 minutes."""
+    key = (query, max_results)
+    now = time.monotonic()
+    cached = _ddg_cache.get(key)
+    if cached is not None and now - cached[0] < _DDG_CACHE_TTL:
+        return cached[1]
+
+    # DDGS is synchronous; run it in a worker so other tools keep being served
+    items = await asyncio.to_thread(ddg_text_search, query, max_results)
+
+    _ddg_cache.pop(key, None)
+    if len(_ddg_cache) >= _DDG_CACHE_MAX:
+        del _ddg_cache[next(iter(_ddg_cache))]
+    _ddg_cache[key] = (now, items)
+    return items
 
 
 def register_transit_tools(app: FastMCP):
@@ -17,21 +49,15 @@ def register_transit_tools(app: FastMCP):
 
     async def _osrm_route(mode, a, b):
         """Get route information using OSRM."""
-        profile = {
-            "driving": "driving",
-            "walking": "walking",
-            "cycling": "cycling",
-        }.get(mode, "driving")
+        profile = _OSRM_PROFILES.get(mode, "driving")
 
         try:
             client = get_http_client()
-            url = f"https://router.project-osrm.org/route/v1/{profile}/{a[1]},{a[0]};{b[1]},{b[0]}"
-            params = {"overview": "false", "alternatives": "false", "steps": "false"}
-
-            response = await client.get(url, params=params)
+            url = f"{_OSRM_BASE}/route/v1/{profile}/{a[1]},{a[0]};{b[1]},{b[0]}"
+            response = await client.get(url, params=_OSRM_ROUTE_PARAMS)
 
             if response.status_code == 200:
-                j = response.json()
+                j = json_utils.loads(response.content)
 
                 if not j.get("routes"):
                     return {"error": "no route found", "success": False}
@@ -52,6 +78,44 @@ def register_transit_tools(app: FastMCP):
         except Exception as e:
             return {"error": f"Route calculation failed: {str(e)}", "success": False}
 
+    async def _osrm_table(mode, coords):
+        """Get the full distance/duration matrix between coords in one OSRM call."""
+        profile = _OSRM_PROFILES.get(mode, "driving")
+
+        try:
+            client = get_http_client()
+            points = ";".join(f"{lon},{lat}" for lat, lon in coords)
+            url = f"{_OSRM_BASE}/table/v1/{profile}/{points}"
+            response = await client.get(url, params=_OSRM_TABLE_PARAMS)
+
+            if response.status_code == 200:
+                j = json_utils.loads(response.content)
+                if j.get("code") != "Ok":
+                    return {
+                        "error": j.get("message", "no table found"),
+                        "success": False,
+                    }
+                return {
+                    "mode": profile,
+                    "distances_km": [
+                        [None if d is None else round(d / 1000, 2) for d in row]
+                        for row in j.get("distances", [])
+                    ],
+                    "durations_min": [
+                        [None if d is None else round(d / 60, 1) for d in row]
+                        for row in j.get("durations", [])
+                    ],
+                    "success": True,
+                }
+            else:
+                return {
+                    "error": f"OSRM API returned status {response.status_code}",
+                    "success": False,
+                }
+
+        except Exception as e:
+            return {"error": f"Route matrix failed: {str(e)}", "success": False}
+
     @app.tool()
     async def transit_journeys(from_place, to_place, datetime_iso=None, max_results=3):
         """
@@ -69,17 +133,7 @@ def register_transit_tools(app: FastMCP):
                 pass  # Ignore if datetime is invalid
 
         try:
-            items = []
-            with DDGS() as ddgs:
-                search_results = ddgs.text(query, max_results=max_results)
-                for r in search_results:
-                    items.append(
-                        {
-                            "title": r.get("title", ""),
-                            "url": r.get("href", ""),
-                            "snippet": r.get("body", ""),
-                        }
-                    )
+            items = await _ddg_search(query, max_results)
 
             return {
                 "search_query": query,
@@ -97,33 +151,23 @@ def register_transit_tools(app: FastMCP):
                 "success": False,
             }
 
-    @app.tool()
-    async def driving_route(from_place, to_place, mode="driving"):
-        """
-        Get distance/time by car/walk/bike via OSRM.
-        mode options: 'driving', 'walking', 'cycling'
-        """
-
-        def norm(q):
-            """Normalize place to lat,lon coordinates."""
-            return parse_latlon(q)
-
+    async def _resolve_place(place):
+        """Normalize place to lat,lon coordinates, geocoding names if needed."""
         # Try to parse coordinates directly first
-        a = norm(from_place)
-        b = norm(to_place)
-
-        # Geocode if needed
+        coords = parse_latlon(place)
+        if coords:
+            return coords
+        g = await geocode_place(place)
+        if not g:
+            return None
+        return (g["lat"], g["lon"])
+
+    async def _route_between(mode, from_place, to_place, a, b):
+        """Route between already-resolved endpoints and attach place info."""
         if not a:
-            g = await geocode_place(from_place)
-            if not g:
-                return {"error": f"could not geocode '{from_place}'", "success": False}
-            a = (g["lat"], g["lon"])
-
+            return {"error": f"could not geocode '{from_place}'", "success": False}
         if not b:
-            g = await geocode_place(to_place)
-            if not g:
-                return {"error": f"could not geocode '{to_place}'", "success": False}
-            b = (g["lat"], g["lon"])
+            return {"error": f"could not geocode '{to_place}'", "success": False}
 
         # Get route
         result = await _osrm_route(mode, a, b)
@@ -141,34 +185,55 @@ def register_transit_tools(app: FastMCP):
 
         return result
 
+    @app.tool()
+    async def driving_route(from_place, to_place, mode="driving"):
+        """
+        Get distance/time by car/walk/bike via OSRM.
+        mode options: 'driving', 'walking', 'cycling'
+        """
+
+        a = await _resolve_place(from_place)
+        if not a:
+            return {"error": f"could not geocode '{from_place}'", "success": False}
+        b = await _resolve_place(to_place)
+
+        return await _route_between(mode, from_place, to_place, a, b)
+
     @app.tool()
     async def multi_modal_route(from_place, to_place):
         """
         Get routing options for multiple transportation modes.
         """
 
-        results = {}
         modes = ["driving", "walking", "cycling"]
 
-        for mode in modes:
-            try:
-                route_result = await driving_route(from_place, to_place, mode)
-                results[mode] = route_result
-            except Exception as e:
-                results[mode] = {
-                    "error": f"Failed to get {mode} route: {str(e)}",
+        # Geocode both endpoints once, then query every mode concurrently
+        a, b = await asyncio.gather(
+            _resolve_place(from_place), _resolve_place(to_place)
+        )
+        gathered = await asyncio.gather(
+            *(_route_between(mode, from_place, to_place, a, b) for mode in modes),
+            transit_journeys(from_place, to_place, max_results=2),
+            return_exceptions=True,
+        )
+
+        results = {}
+        for mode, route_result in zip(modes, gathered):
+            if isinstance(route_result, Exception):
+                route_result = {
+                    "error": f"Failed to get {mode} route: {str(route_result)}",
                     "success": False,
                 }
+            results[mode] = route_result
 
         # Add transit search
-        try:
-            transit_result = await transit_journeys(from_place, to_place, max_results=2)
-            results["public_transit"] = transit_result
-        except Exception as e:
-            results["public_transit"] = {
-                "error": f"Transit search failed: {str(e)}",
+        transit_result = gathered[-1]
+        if isinstance(transit_result, Exception):
+            transit_result = {
+                "error": f"Transit search failed: {str(transit_result)}",
                 "success": False,
             }
+        results["public_transit"] = transit_result
 
         # Calculate summary
         successful_modes = sum(1 for r in results.values() if r.get("success"))
@@ -183,6 +248,26 @@ def register_transit_tools(app: FastMCP):
             },
         }
 
+    @app.tool()
+    async def route_matrix(places, mode="driving"):
+        """
+        Get distance/time between every pair of places via OSRM in a single call.
+        places = list of city names or 'lat,lon'; mode: 'driving', 'walking', 'cycling'
+        """
+
+        if not places or len(places) < 2:
+            return {"error": "Need at least 2 places", "success": False}
+
+        coords = await asyncio.gather(*(_resolve_place(p) for p in places))
+        for place, c in zip(places, coords):
+            if not c:
+                return {"error": f"could not geocode '{place}'", "success": False}
+
+        result = await _osrm_table(mode, coords)
+        if result.get("success"):
+            result.update({"places": places, "coords": coords})
+        return result
+
     @app.tool()
     async def nearby_transit_stops(place, radius_km=1.0):
         """
@@ -192,17 +277,7 @@ def register_transit_tools(app: FastMCP):
         query = f"public transit stops stations near {place} within {radius_km}km"
 
         try:
-            items = []
-            with DDGS() as ddgs:
-                search_results = ddgs.text(query, max_results=5)
-                for r in search_results:
-                    items.append(
-                        {
-                            "title": r.get("title", ""),
-                            "url": r.get("href", ""),
-                            "snippet": r.get("body", ""),
-                        }
-                    )
+            items = await _ddg_search(query, 5)
 
             return {
                 "search_query": query,
@@ -11,6 +11,18 @@ from utils.openai_client import get_openai_client, has_openai_client
 from utils.prompt_loader import load_prompt
 
 
+async def _stream_completion(client, **kwargs):
+    """Run a streamed chat completion and return the concatenated text."""
+    stream = await client.chat.completions.create(stream=True, **kwargs)
+    parts = []
+    async for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+    return "".join(parts)
+
+
 def register_ai_tools(app: FastMCP):
     """Register AI-powered tools with the FastMCP app."""
 
@@ -30,7 +42,8 @@ def register_ai_tools(app: FastMCP):
             user_prompt += f"\nAdditional context: {context}"
 
         try:
-            response = await client.chat.completions.create(
+            advice = await _stream_completion(
+                client,
                 model=Config.OPENROUTER_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -41,7 +54,7 @@ def register_ai_tools(app: FastMCP):
             )
 
             return {
-                "advice": response.choices[0].message.content,
+                "advice": advice,
                 "model": Config.OPENROUTER_MODEL,
             }
         except Exception as e:
@@ -60,7 +73,8 @@ def register_ai_tools(app: FastMCP):
         user_prompt = f"Original user query: '{query}'\n\nTool outputs:\n{tool_outputs}"
 
         try:
-            response = await client.chat.completions.create(
+            itinerary = await _stream_completion(
+                client,
                 model=Config.OPENROUTER_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -69,6 +83,6 @@ def register_ai_tools(app: FastMCP):
                 max_tokens=4096,  # Increased token limit for more detailed itineraries
                 temperature=0.2,
             )
-            return {"itinerary": response.choices[0].message.content}
+            return {"itinerary": itinerary}
         except Exception as e:
             return {"error": f"Failed to create itinerary: {e}"}
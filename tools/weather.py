@@ -4,29 +4,52 @@ Weather tool for the travel agent.
 Provides weather forecast functionality.
 """
 
+import time
+
 from mcp.server.fastmcp import FastMCP
 
 from config import Config
+from utils import json_utils
 from utils.geo_utils import geocode_place, parse_latlon
 from utils.http_client import get_http_client
 
+# Forecasts keyed by (lat, lon, days) with coordinates rounded to 2 decimals
+# (~1km, finer than the Open-Meteo grid) -> (stored_at, forecast)
+_forecast_cache = {}
+_FORECAST_TTL = 3600
+_FORECAST_CACHE_MAX = 4096
+
 
 def register_weather_tool(app: FastMCP):
     """Register the weather tool with the FastMCP app."""
 
     async def _weather_daily(lat, lon, days=7):
         """Get weather forecast for given coordinates."""
+        lat, lon = round(lat, 2), round(lon, 2)
+        days = max(1, min(14, int(days)))
+        key = (lat, lon, days)
+        now = time.monotonic()
+        cached = _forecast_cache.get(key)
+        if cached is not None and now - cached[0] < _FORECAST_TTL:
+            return cached[1]
+
         client = get_http_client()
         url = "https://api.open-meteo.com/v1/forecast"
         params = {
             "latitude": lat,
             "longitude": lon,
             "daily": "weathercode,temperature_2m_max,temperature_2m_min,precipitation_sum",
-            "forecast_days": max(1, min(14, int(days))),
+            "forecast_days": days,
             "timezone": "auto",
         }
         r = await client.get(url, params=params)
-        return r.json()
+        forecast = json_utils.loads(r.content)
+        if r.status_code == 200:
+            _forecast_cache.pop(key, None)
+            if len(_forecast_cache) >= _FORECAST_CACHE_MAX:
+                del _forecast_cache[next(iter(_forecast_cache))]
+            _forecast_cache[key] = (now, forecast)
+        return forecast
 
     @app.tool()
     async def weather_forecast(place_or_latlon, days=Config.DEFAULT_WEATHER_DAYS):
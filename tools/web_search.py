@@ -4,9 +4,12 @@ Web search tool for the travel agent.
 Provides basic web search functionality using DuckDuckGo.
 """
 
-from duckduckgo_search import DDGS
+import asyncio
+
 from mcp.server.fastmcp import FastMCP
 
+from utils.search_utils import ddg_text_search
+
 
 def register_web_search_tool(app: FastMCP):
     """Register the web search tool with the FastMCP app."""
@@ -17,18 +20,10 @@ def register_web_search_tool(app: FastMCP):
         max_results = int(max_results) if isinstance(max_results, str) else max_results
         items = []
         try:
-            with DDGS() as ddgs:
-                results = ddgs.text(
-                    query, region="us-en", max_results=max(1, min(10, max_results))
-                )
-                for r in results:
-                    items.append(
-                        {
-                            "title": r.get("title", ""),
-                            "url": r.get("href", ""),
-                            "snippet": r.get("body", ""),
-                        }
-                    )
+            # DDGS is synchronous; keep it off the event loop
+            items = await asyncio.to_thread(
+                ddg_text_search, query, max(1, min(10, max_results)), "us-en"
+            )
         except Exception as e:
             print(f"Web search error: {e}")
             pass
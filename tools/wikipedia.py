@@ -4,40 +4,92 @@ Wikipedia tool for the travel agent.
 Provides Wikipedia summary functionality.
 """
 
+import asyncio
+import time
+
 from mcp.server.fastmcp import FastMCP
 
+from utils import json_utils
 from utils.geo_utils import geocode_place
 from utils.http_client import get_http_client
 
+# Summaries keyed by normalized title -> (stored_at, summary_or_None, etag).
+# None records a 404 so repeat misses skip the network.
+_wiki_cache = {}
+_WIKI_CACHE_TTL = 86400
+_WIKI_CACHE_MAX = 2048
+
 
 def register_wikipedia_tool(app: FastMCP):
     """Register the Wikipedia tool with the FastMCP app."""
 
+    def _store(key, summary, etag=None):
+        """Cache a summary (or a miss), evicting the oldest entry when full."""
+        _wiki_cache.pop(key, None)
+        if len(_wiki_cache) >= _WIKI_CACHE_MAX:
+            del _wiki_cache[next(iter(_wiki_cache))]
+        _wiki_cache[key] = (time.monotonic(), summary, etag)
+
     async def _wiki_summary_raw(title):
         """Get Wikipedia summary for a given title."""
-        client = get_http_client()
         safe = title.replace(" ", "_")
+        key = safe.lower()
+        cached = _wiki_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _WIKI_CACHE_TTL:
+            return cached[1]
+
+        client = get_http_client()
         url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{safe}"
-        r = await client.get(url)
+        headers = {}
+        if cached is not None and cached[2]:
+            # Stale entry: revalidate instead of downloading it again
+            headers["If-None-Match"] = cached[2]
+        r = await client.get(url, headers=headers)
+        if r.status_code == 304 and cached is not None:
+            _store(key, cached[1], cached[2])
+            return cached[1]
         if r.status_code == 200:
-            j = r.json()
-            return {
+            j = json_utils.loads(r.content)
+            summary = {
                 "title": j.get("title"),
                 "extract": j.get("extract"),
                 "description": j.get("description"),
                 "url": j.get("content_urls", {}).get("desktop", {}).get("page"),
             }
+            _store(key, summary, r.headers.get("etag"))
+            return summary
+        if r.status_code == 404:
+            _store(key, None)
         return None
 
+    async def _wiki_summary_via_geocode(title_or_place):
+        """Resolve the query to a place name, then look that up."""
+        g = await geocode_place(title_or_place)
+        if g and g.get("name"):
+            return await _wiki_summary_raw(g["name"])
+        return None
+
+    async def _discard(task):
+        """Cancel an unneeded task and consume its result or exception."""
+        task.cancel()
+        # Otherwise an exception it already raised is logged as never retrieved
+        await asyncio.gather(task, return_exceptions=True)
+
     @app.tool()
     async def wiki_summary(title_or_place):
         """Get Wikipedia summary for a title or place."""
-        s = await _wiki_summary_raw(title_or_place)
+        # Start the geocode fallback speculatively so a direct miss doesn't
+        # cost two more sequential round trips
+        fallback_task = asyncio.create_task(_wiki_summary_via_geocode(title_or_place))
+        try:
+            s = await _wiki_summary_raw(title_or_place)
+        except BaseException:
+            await _discard(fallback_task)
+            raise
+        if s:
+            await _discard(fallback_task)
+            return s
+        s = await fallback_task
         if s:
             return s
-        g = await geocode_place(title_or_place)
-        if g and g.get("name"):
-            s = await _wiki_summary_raw(g["name"])
-            if s:
-                return s
         return {"error": f"no summary for '{title_or_place}'"}
@@ -1,30 +1,57 @@
 #!/usr/bin/env python3
+import logging
 import warnings
 
-warnings.filterwarnings("ignore")
+# Only silence the known-noisy library warnings; anything else is still reported
+for _module in ("pydantic", "llama_index"):
+    warnings.filterwarnings("ignore", category=DeprecationWarning, module=_module)
+    warnings.filterwarnings("ignore", category=UserWarning, module=_module)
+logging.captureWarnings(True)
 import asyncio
-import json
 import os
+import re
 import sys
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
 from dateutil.parser import parse as dateparse
-from fastmcp.client import Client
-from fastmcp.client.transports import StreamableHttpTransport
 from llama_index.core.llms import ChatMessage, MessageRole
 from llama_index.core.workflow import StartEvent, StopEvent, Workflow, step
 from llama_index.llms.openai import OpenAI
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt
 
 from config import Config
+from utils import json_utils
 from utils.date_utils import infer_future_date
-from utils.performance_tracker import track_performance
+from utils.mcp_pool import close_mcp_pool, get_mcp_pool
+from utils.performance_tracker import close_performance_log, track_performance
 from utils.prompt_loader import SYSTEM_PROMPT, load_prompt
 
 console = Console()
 
+# Static for the lifetime of the process
+_SYSTEM_PROMPT_TEXT = load_prompt(SYSTEM_PROMPT)
+
+# The evaluation step is asking the user something rather than answering
+_CLARIFY_RE = re.compile(
+    r"need to know|clarify|question|missing|where|when|how many", re.IGNORECASE
+)
+# The initial answer expects more input from the user
+_FOLLOWUP_RE = re.compile(
+    r"need|clarify|question|provide|could you|what are", re.IGNORECASE
+)
+
+# Tool-result size limits before results go to the console or the model
+_MAX_RESULT_TEXT = 500
+_MAX_RESULT_STRING = 2000
+
+# Turns kept verbatim once older history is summarized
+_HISTORY_KEEP = 6
+
 
 def _build_llm():
     api_key = Config.get_openai_api_key()
@@ -45,110 +72,303 @@ def _build_llm():
         )
 
 
-async def _list_tools_for_openai(base_url):
-    transport = StreamableHttpTransport(url=f"{base_url}/mcp")
-    async with Client(transport) as client:
+def get_mcp_client(base_url):
+    """Hold the shared MCP client for the server, connecting on first use."""
+    # Kept open across tool calls so each call skips the connection and
+    # MCP initialize handshake; held so the pool can't close it mid-call
+    return get_mcp_pool().session(f"{base_url}/mcp")
+
+
+# OpenAI tool specs keyed by server URL -> (fetched_at, tools); the catalog
+# rarely changes, so it is only refetched after the TTL or an unknown-tool error
+_openai_tools_cache = {}
+_TOOLS_CACHE_TTL = 300.0
+
+
+def invalidate_tool_cache(base_url):
+    """Force the next tool listing for base_url to refetch."""
+    _openai_tools_cache.pop(base_url, None)
+
+
+# Sent with their full schema; every other tool goes out in compact form
+_FULL_SCHEMA_TOOLS = frozenset({"get_tool_schema"})
+# Duplicates the compact specs themselves, so it isn't sent at all
+_INDEX_ONLY_TOOLS = frozenset({"list_available_tools"})
+# Argument schema keys kept in the compact form
+_COMPACT_ARG_KEYS = ("type", "items", "enum", "anyOf")
+
+
+def _compact_schema(schema):
+    """Strip titles, descriptions and defaults from a tool's argument schema."""
+    schema = schema or {}
+    compact = {
+        "type": "object",
+        "properties": {
+            name: {k: arg[k] for k in _COMPACT_ARG_KEYS if k in arg}
+            for name, arg in schema.get("properties", {}).items()
+        },
+    }
+    if schema.get("required"):
+        compact["required"] = schema["required"]
+    return compact
+
+
+async def _list_tools_for_openai(base_url, refresh=False):
+    cached = _openai_tools_cache.get(base_url)
+    if (
+        not refresh
+        and cached is not None
+        and time.monotonic() - cached[0] < _TOOLS_CACHE_TTL
+    ):
+        return cached[1]
+    async with get_mcp_client(base_url) as client:
         tools = await client.list_tools()
-        openai_tools = []
-        for t in tools:
-            openai_tools.append(
-                {
-                    "type": "function",
-                    "function": {
-                        "name": t.name,
-                        "description": t.description or "",
-                        "parameters": t.inputSchema
-                        or {"type": "object", "properties": {}},
-                    },
-                }
-            )
-        return openai_tools
+    openai_tools = []
+    for t in tools:
+        if t.name in _INDEX_ONLY_TOOLS:
+            continue
+        if t.name in _FULL_SCHEMA_TOOLS:
+            description = t.description or ""
+            parameters = t.inputSchema or {"type": "object", "properties": {}}
+        else:
+            # The model sees a one-line summary and bare argument types; the
+            # full docs are fetched through get_tool_schema when needed
+            description = (t.description or "").strip().split("\n", 1)[0]
+            parameters = _compact_schema(t.inputSchema)
+        openai_tools.append(
+            {
+                "type": "function",
+                "function": {
+                    "name": t.name,
+                    "description": description,
+                    "parameters": parameters,
+                },
+            }
+        )
+    _openai_tools_cache[base_url] = (time.monotonic(), openai_tools)
+    return openai_tools
+
+
+_JSON_OBJECT_START = ("{",)
+_JSON_CONTAINER_START = ("{", "[")
+
+
+def _parse_json_text(text, starts=_JSON_CONTAINER_START):
+    """Parse text as JSON if it looks like a JSON container, else return it as is."""
+    stripped = text.lstrip()
+    # Plain-text results skip the parser instead of failing through it
+    if not stripped.startswith(starts):
+        return text
+    try:
+        return json_utils.loads(stripped)
+    except json_utils.JSONDecodeError:
+        return text
+
+
+# Memory tools only touch the local memory directory, so they can skip the RPC
+_LOCAL_MEMORY_TOOLS = frozenset(
+    {
+        "batch_travel_memory",
+        "list_travel_memories",
+        "retrieve_travel_memory",
+        "store_travel_memory",
+    }
+)
+
+
+def _call_local_memory_tool(tool_name, args):
+    """Run a memory tool in this process; blocking file I/O, so call off the loop."""
+    # Imported lazily so the client only needs server deps when MCP_INPROC is set
+    from tools import memory
+
+    return getattr(memory, tool_name)(**args)
 
 
 async def _call_tool(base_url, tool_name, args):
-    transport = StreamableHttpTransport(url=f"{base_url}/mcp")
-    async with Client(transport) as client:
+    if Config.MCP_INPROC and tool_name in _LOCAL_MEMORY_TOOLS:
+        return await asyncio.to_thread(_call_local_memory_tool, tool_name, args)
+    async with get_mcp_client(base_url) as client:
         result_obj = await client.call_tool(tool_name, args)
-        if (
-            hasattr(result_obj, "structured_content")
-            and result_obj.structured_content
-            and "result" in result_obj.structured_content
-        ):
-            result = result_obj.structured_content["result"]
-            if isinstance(result, str):
-                try:
-                    return json.loads(result)
-                except json.JSONDecodeError:
-                    return result
-            return result
-        if hasattr(result_obj, "content") and result_obj.content:
-            if isinstance(result_obj.content, list) and len(result_obj.content) > 0:
-                first_content = result_obj.content[0]
-                if hasattr(first_content, "text"):
-                    content = first_content.text
-                    if isinstance(content, str) and content.strip().startswith("{"):
-                        try:
-                            return json.loads(content)
-                        except json.JSONDecodeError:
-                            return content
-                    return content
-                return str(first_content)
-            return result_obj.content
-        if (
-            hasattr(result_obj, "content")
-            and isinstance(result_obj.content, list)
-            and len(result_obj.content) == 0
-        ):
-            return []
-        if not hasattr(result_obj, "is_error") or result_obj.is_error:
-            console.print(
-                f"[bold red]Warning: Unexpected tool result structure for {tool_name}: {result_obj}[/bold red]"
-            )
-        return {
-            "error": "Failed to parse tool result from MCP server",
-            "data": str(result_obj),
-        }
+    if (
+        hasattr(result_obj, "structured_content")
+        and result_obj.structured_content
+        and "result" in result_obj.structured_content
+    ):
+        result = result_obj.structured_content["result"]
+        if isinstance(result, str):
+            return _parse_json_text(result)
+        return result
+    if hasattr(result_obj, "content") and result_obj.content:
+        if isinstance(result_obj.content, list) and len(result_obj.content) > 0:
+            first_content = result_obj.content[0]
+            if hasattr(first_content, "text"):
+                content = first_content.text
+                if isinstance(content, str):
+                    return _parse_json_text(content, _JSON_OBJECT_START)
+                return content
+            return str(first_content)
+        return result_obj.content
+    if (
+        hasattr(result_obj, "content")
+        and isinstance(result_obj.content, list)
+        and len(result_obj.content) == 0
+    ):
+        return []
+    if not hasattr(result_obj, "is_error") or result_obj.is_error:
+        console.print(
+            f"[bold red]Warning: Unexpected tool result structure for {tool_name}: {result_obj}[/bold red]"
+        )
+    return {
+        "error": "Failed to parse tool result from MCP server",
+        "data": str(result_obj),
+    }
 
 
-async def store_conversation_memory(base_url, user_query, agent_response):
-    """Store conversation context in memory."""
+async def _batch_memory(base_url, store=None, list_limit=None):
+    """Store memories and/or list recent ones in one MCP round trip."""
+    args = {"store": store or []}
+    if list_limit is not None:
+        args["list_limit"] = list_limit
+    return await _call_tool(base_url, "batch_travel_memory", args)
+
+
+def _conversation_memory_entry(user_query, agent_response):
+    """Build the memory store entry for one conversation turn."""
+    now = datetime.now()
+    return {
+        # Microsecond keys don't collide for writes in the same second
+        "key": f"conversation_{int(now.timestamp() * 1_000_000)}",
+        "data": {
+            "timestamp": now.isoformat(),
+            "user_query": user_query,
+            "agent_response": agent_response,
+            "conversation_type": "travel_planning",
+        },
+    }
+
+
+async def archive_conversation_turns(base_url, key, turns):
+    """Store raw conversation turns in memory. Returns True on success."""
     memory_data = {
         "timestamp": datetime.now().isoformat(),
-        "user_query": user_query,
-        "agent_response": agent_response,
-        "conversation_type": "travel_planning",
+        "turns": [{"role": m.role.value, "content": m.content} for m in turns],
+        "conversation_type": "archived_turns",
     }
-
     try:
-        await _call_tool(
-            base_url,
-            "store_travel_memory",
-            {
-                "key": f"conversation_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                "data": memory_data,
-            },
+        result = await _batch_memory(
+            base_url, store=[{"key": key, "data": memory_data}]
         )
+        return bool(result["stored"][0].get("success"))
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not store memory: {e}[/yellow]")
+        console.print(f"[yellow]Warning: Could not archive turns: {e}[/yellow]")
+        return False
+
+
+# Queued memory writes, drained by a small pool of workers
+_MEMORY_WRITERS = 2
+_memory_queue = None
+_memory_workers = []
+
+
+async def _memory_worker(base_url):
+    """Write queued memory entries, batching whatever has piled up into one call."""
+    while True:
+        entries = [await _memory_queue.get()]
+        while not _memory_queue.empty():
+            entries.append(_memory_queue.get_nowait())
+        try:
+            await _batch_memory(base_url, store=entries)
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not store memory: {e}[/yellow]")
+        finally:
+            for _ in entries:
+                _memory_queue.task_done()
+
+
+def store_conversation_memory_in_background(base_url, user_query, agent_response):
+    """Queue a memory write without delaying the response."""
+    global _memory_queue
+    if _memory_queue is None:
+        _memory_queue = asyncio.Queue()
+        _memory_workers.extend(
+            asyncio.create_task(_memory_worker(base_url))
+            for _ in range(_MEMORY_WRITERS)
+        )
+    _memory_queue.put_nowait(_conversation_memory_entry(user_query, agent_response))
+
+
+async def close_memory_writer():
+    """Flush queued memory writes and stop the workers."""
+    global _memory_queue
+    if _memory_queue is None:
+        return
+    await _memory_queue.join()
+    for worker in _memory_workers:
+        worker.cancel()
+    await asyncio.gather(*_memory_workers, return_exceptions=True)
+    _memory_workers.clear()
+    _memory_queue = None
 
 
 async def get_conversation_history(base_url):
     """Retrieve recent conversation history from memory."""
     try:
-        memories = await _call_tool(base_url, "list_travel_memories", {})
-        if isinstance(memories, list):
-            return memories[-5:]  # Get last 5 conversations
+        result = await _batch_memory(base_url, list_limit=5)  # Last 5 conversations
+        if isinstance(result, dict) and isinstance(result.get("memories"), list):
+            return result["memories"]
         return []
     except Exception:
         return []
 
 
-async def _execute_tool_call(tool_call, base_url: str, perf_tracker, workflow):
-    """Helper function to execute a single tool call."""
+def _build_stable_prefix(memories):
+    """Build the system messages shared unchanged by every LLM call in a session."""
+    prefix = [ChatMessage(role=MessageRole.SYSTEM, content=_SYSTEM_PROMPT_TEXT)]
+    lines = [
+        f"- {memory['timestamp']}: {memory['preview']}"
+        for memory in memories
+        if "timestamp" in memory and "preview" in memory
+    ]
+    if lines:
+        prefix.append(
+            ChatMessage(
+                role=MessageRole.SYSTEM,
+                content="Recent conversations with this user:\n" + "\n".join(lines),
+            )
+        )
+    return prefix
+
+
+def _new_progress():
+    """Create the progress display shared by everything in flight during a turn."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        console=console,
+        transient=True,
+    )
+
+
+@contextmanager
+def _progress_task(progress, description):
+    """Show a line in the shared progress display while the block runs."""
+    task_id = progress.add_task(description, total=None)
+    try:
+        yield
+    finally:
+        progress.remove_task(task_id)
+
+
+async def _invoke_tool_call(tool_call, base_url: str, perf_tracker, workflow):
+    """Run a single tool call over MCP without rendering its result.
+
+    Returns (tool_call, (display, storage), error) with exactly one of the
+    filtered pair and error set.
+    """
     tool_name = tool_call.function.name
     try:
-        tool_args = json.loads(tool_call.function.arguments)
-    except json.JSONDecodeError:
+        tool_args = json_utils.loads(tool_call.function.arguments)
+    except json_utils.JSONDecodeError:
         tool_args = {}
 
     console.print(
@@ -156,73 +376,176 @@ async def _execute_tool_call(tool_call, base_url: str, perf_tracker, workflow):
     )
 
     try:
-        with console.status(f"[bold green]Executing {tool_name}..."):
-            perf_tracker.add_tool_call()
-            tool_result = await _call_tool(base_url, tool_name, tool_args)
+        async with workflow._tool_sem:
+            with _progress_task(
+                workflow.progress, f"[bold green]Executing {tool_name}..."
+            ):
+                perf_tracker.add_tool_call()
+                tool_result = await _call_tool(base_url, tool_name, tool_args)
+        return tool_call, workflow._filter_tool_result_both(tool_result), None
+    except Exception as e:
+        perf_tracker.add_error()
+        if "unknown tool" in str(e).lower():
+            # The server's catalog changed under us
+            invalidate_tool_cache(base_url)
+        return tool_call, None, e
+
+
+def _render_tool_calls(outcomes):
+    """Print the result panel or failure for each finished tool call."""
+    for tool_call, filtered, error in outcomes:
+        tool_name = tool_call.function.name
+        if error is not None:
+            console.print(f"[red]{tool_name} failed: {error}[/red]")
+            continue
         console.print(f"[green]{tool_name} completed.[/green]")
 
-        display_result = workflow._filter_tool_result(tool_result, display_only=True)
         console.print(
             Panel(
-                json.dumps(display_result, indent=2),
+                json_utils.dumps(filtered[0], indent=True),
                 title=f"[green]Result from {tool_name}[/green]",
                 border_style="green",
                 expand=False,
             )
         )
 
-        filtered_result = workflow._filter_tool_result(tool_result)
-        return ChatMessage(
-            role=MessageRole.TOOL,
-            content=json.dumps(filtered_result),
-            additional_kwargs={"tool_call_id": tool_call.id},
-        )
-    except Exception as e:
-        perf_tracker.add_error()
-        console.print(f"[red]{tool_name} failed: {e}[/red]")
-        error_message = f"Error executing tool {tool_name}: {e}"
-        return ChatMessage(
-            role=MessageRole.TOOL,
-            content=json.dumps({"error": error_message}),
-            additional_kwargs={"tool_call_id": tool_call.id},
-        )
+
+def _tool_message(outcome):
+    """Build the TOOL chat message the model sees for a finished tool call."""
+    tool_call, filtered, error = outcome
+    if error is not None:
+        error_message = f"Error executing tool {tool_call.function.name}: {error}"
+        content = json_utils.dumps({"error": error_message})
+    else:
+        content = json_utils.dumps(filtered[1])
+    return ChatMessage(
+        role=MessageRole.TOOL,
+        content=content,
+        additional_kwargs={"tool_call_id": tool_call.id},
+    )
 
 
 class InteractiveTravelWorkflow(Workflow):
-    def __init__(self, base_url, llm, conversation_history: list, max_calls=15):
+    def __init__(
+        self,
+        base_url,
+        llm,
+        conversation_history: list,
+        max_calls=15,
+        stable_prefix=None,
+        progress=None,
+    ):
         super().__init__(timeout=600, verbose=True)
         self.base_url = base_url
         self.llm = llm
         self.conversation_history = conversation_history
+        # Identical leading messages for every call so provider prompt caching hits
+        self.stable_prefix = stable_prefix or _build_stable_prefix([])
+        # One renderer for all spinners in the turn; the caller starts and stops it
+        self.progress = progress or _new_progress()
         self.max_calls = max_calls
-
-    def _filter_tool_result(self, tool_result, display_only=False):
-        """Filter tool results to prevent context poisoning or for clean display."""
-        if not isinstance(tool_result, dict):
-            return (
-                str(tool_result)[:500]
-                if len(str(tool_result)) > 500
-                else str(tool_result)
+        # Set when the answer was already printed while streaming
+        self.streamed = False
+        # Bounds the fan-out when the model returns many tool calls at once
+        self._tool_sem = asyncio.Semaphore(Config.MCP_MAX_CONCURRENT_TOOLS)
+
+    async def _compact_history(self, perf_tracker, keep=_HISTORY_KEEP):
+        """Replace all but the last `keep` turns with a summary once history grows.
+
+        The raw turns are archived in memory so the agent can still read them
+        back with retrieve_travel_memory.
+        """
+        history = self.conversation_history
+        if len(history) <= keep + 4:
+            return
+        cut = len(history) - keep
+        # Start the verbatim window on a user turn
+        while cut > 0 and history[cut].role != MessageRole.USER:
+            cut -= 1
+        old_turns = history[:cut]
+        if not old_turns:
+            return
+
+        archive_key = f"history_{int(time.time() * 1_000_000)}"
+        transcript = "\n".join(
+            f"{m.role.value}: {m.content}" for m in old_turns if m.content
+        )
+        try:
+            with _progress_task(
+                self.progress, "[bold yellow]Summarizing earlier conversation..."
+            ):
+                perf_tracker.add_api_call()
+                archived, response = await asyncio.gather(
+                    archive_conversation_turns(self.base_url, archive_key, old_turns),
+                    self.llm.achat(
+                        [
+                            ChatMessage(
+                                role=MessageRole.USER,
+                                content="Summarize this travel planning conversation in one short paragraph. Keep destinations, dates, travelers, budget, preferences and decisions made.\n\n"
+                                + transcript,
+                            )
+                        ]
+                    ),
+                )
+        except Exception as e:
+            # Keep the full history rather than failing the turn
+            perf_tracker.add_error()
+            console.print(f"[yellow]Warning: Could not summarize history: {e}[/yellow]")
+            return
+
+        summary = f"Conversation so far: {response.message.content}"
+        if archived:
+            summary += (
+                "\nThe full earlier turns are stored under memory key "
+                f"'{archive_key}'; use retrieve_travel_memory if exact details "
+                "are needed."
             )
+        history[:cut] = [ChatMessage(role=MessageRole.SYSTEM, content=summary)]
+
+    async def _stream_final(self, messages, perf_tracker):
+        """Stream a text-only completion to the console and return the full text."""
+        perf_tracker.add_api_call()
+        stream = await self.llm.astream_chat(messages)
+        console.rule("[bold green]Travel Agent Response[/bold green]")
+        parts = []
+        async for chunk in stream:
+            if chunk.delta:
+                if not parts:
+                    perf_tracker.mark_first_token()
+                console.print(chunk.delta, end="", markup=False, highlight=False)
+                parts.append(chunk.delta)
+        console.print()
+        console.rule(style="green")
+        self.streamed = True
+        return "".join(parts)
+
+    def _filter_tool_result_both(self, tool_result):
+        """Filter a tool result for display and for the model's context in one pass.
+
+        Returns (display_filtered, storage_filtered).
+        """
+        if not isinstance(tool_result, dict):
+            text = str(tool_result)
+            if len(text) > _MAX_RESULT_TEXT:
+                text = text[:_MAX_RESULT_TEXT]
+            return text, text
 
-        filtered = {}
+        display = {}
+        storage = {}
         for key, value in tool_result.items():
-            is_base64 = "base64" in key.lower()
-            is_long_str = isinstance(value, str) and len(value) > 2000
-
-            if is_base64:
-                if display_only:
-                    continue  # Skip for display
-                else:
-                    filtered[key] = "[image data removed]"
-            elif is_long_str:
-                if display_only:
-                    filtered[key] = f"[truncated string, {len(value)} chars]"
-                else:
-                    filtered[key] = value[:2000] + "...[truncated]"
-            else:
-                filtered[key] = value
-        return filtered
+            if "base64" in key.lower():
+                # Skipped for display, stubbed out for the model
+                storage[key] = "[image data removed]"
+                continue
+            if isinstance(value, str):
+                lv = len(value)
+                if lv > _MAX_RESULT_STRING:
+                    display[key] = f"[truncated string, {lv} chars]"
+                    storage[key] = f"{value[:_MAX_RESULT_STRING]}...[truncated]"
+                    continue
+            display[key] = value
+            storage[key] = value
+        return display, storage
 
     @step
     async def process_interactive_query(self, _: StartEvent) -> StopEvent:
@@ -230,17 +553,16 @@ class InteractiveTravelWorkflow(Workflow):
         async with track_performance(
             self.conversation_history[-1].content
         ) as perf_tracker:
-            openai_tools = await _list_tools_for_openai(self.base_url)
-            console.print(f"[dim]Available tools: {len(openai_tools)}[/dim]")
+            # Fetch tools while the prompt is assembled
+            tools_task = asyncio.create_task(_list_tools_for_openai(self.base_url))
+            await self._compact_history(perf_tracker)
             is_follow_up = len(self.conversation_history) > 1
             if is_follow_up:
                 console.print(
                     "\n[bold yellow]--- Agent Turn: Continuing Conversation ---[/bold yellow]"
                 )
                 messages = [
-                    ChatMessage(
-                        role=MessageRole.SYSTEM, content=load_prompt(SYSTEM_PROMPT)
-                    ),
+                    *self.stable_prefix,
                     *self.conversation_history,
                     ChatMessage(
                         role=MessageRole.USER,
@@ -248,38 +570,43 @@ class InteractiveTravelWorkflow(Workflow):
                     ),
                 ]
 
-                with console.status("[bold yellow]Processing your request..."):
+                openai_tools = await tools_task
+                console.print(f"[dim]Available tools: {len(openai_tools)}[/dim]")
+                with _progress_task(
+                    self.progress, "[bold yellow]Processing your request..."
+                ):
                     perf_tracker.add_api_call()
-                    response = self.llm.chat(messages, tools=openai_tools)
+                    response = await self.llm.achat(messages, tools=openai_tools)
 
                 response_message = response.message
                 tool_calls = response_message.additional_kwargs.get("tool_calls", [])
 
                 if tool_calls:
                     messages.append(response_message)
-                    tool_results = await asyncio.gather(
+                    outcomes = await asyncio.gather(
                         *(
-                            _execute_tool_call(tc, self.base_url, perf_tracker, self)
+                            _invoke_tool_call(tc, self.base_url, perf_tracker, self)
                             for tc in tool_calls
                         )
                     )
-                    messages.extend(tool_results)
-                    final_response = self.llm.chat(messages)
-                    response_message = final_response.message
+                    messages.extend(_tool_message(o) for o in outcomes)
+                    # Rendered before streaming so the answer isn't interleaved
+                    _render_tool_calls(outcomes)
+                    content = await self._stream_final(messages, perf_tracker)
+                else:
+                    content = response_message.content
                 perf_tracker.print_summary()
-                await store_conversation_memory(
+                store_conversation_memory_in_background(
                     self.base_url,
                     self.conversation_history[-1].content,
-                    response_message.content,
+                    content,
                 )
-                return StopEvent(result=response_message.content)
+                return StopEvent(result=content)
             console.print(
                 "\n[bold yellow]--- Agent Turn: Query Evaluation ---[/bold yellow]"
             )
             evaluation_messages = [
-                ChatMessage(
-                    role=MessageRole.SYSTEM, content=load_prompt(SYSTEM_PROMPT)
-                ),
+                *self.stable_prefix,
                 *self.conversation_history,
                 ChatMessage(
                     role=MessageRole.USER,
@@ -287,9 +614,13 @@ class InteractiveTravelWorkflow(Workflow):
                 ),
             ]
 
-            with console.status("[bold yellow]Evaluating request completeness..."):
+            openai_tools = await tools_task
+            console.print(f"[dim]Available tools: {len(openai_tools)}[/dim]")
+            with _progress_task(
+                self.progress, "[bold yellow]Evaluating request completeness..."
+            ):
                 perf_tracker.add_api_call()
-                evaluation_response = self.llm.chat(
+                evaluation_response = await self.llm.achat(
                     evaluation_messages, tools=openai_tools
                 )
 
@@ -299,31 +630,28 @@ class InteractiveTravelWorkflow(Workflow):
             )
             if evaluation_tool_calls:
                 evaluation_messages.append(evaluation_message)
-                tool_results = await asyncio.gather(
+                outcomes = await asyncio.gather(
                     *(
-                        _execute_tool_call(tc, self.base_url, perf_tracker, self)
+                        _invoke_tool_call(tc, self.base_url, perf_tracker, self)
                         for tc in evaluation_tool_calls
                     )
                 )
-                evaluation_messages.extend(tool_results)
-                evaluation_response = self.llm.chat(
-                    evaluation_messages, tools=openai_tools
+                evaluation_messages.extend(_tool_message(o) for o in outcomes)
+                # Render the results while the next completion is in flight:
+                # yield once so the request goes out, then print on the loop
+                # thread, where the shared progress display also draws
+                llm_task = asyncio.create_task(
+                    self.llm.achat(evaluation_messages, tools=openai_tools)
                 )
+                await asyncio.sleep(0)
+                _render_tool_calls(outcomes)
+                evaluation_response = await llm_task
                 evaluation_message = evaluation_response.message
-            if evaluation_message.content and any(
-                word in evaluation_message.content.lower()
-                for word in [
-                    "need to know",
-                    "clarify",
-                    "question",
-                    "missing",
-                    "where",
-                    "when",
-                    "how many",
-                ]
+            if evaluation_message.content and _CLARIFY_RE.search(
+                evaluation_message.content
             ):
                 perf_tracker.print_summary()
-                await store_conversation_memory(
+                store_conversation_memory_in_background(
                     self.base_url,
                     self.conversation_history[-1].content,
                     evaluation_message.content,
@@ -333,9 +661,7 @@ class InteractiveTravelWorkflow(Workflow):
                 "\n[bold yellow]--- Agent Turn: Travel Planning Clarification ---[/bold yellow]"
             )
             messages = [
-                ChatMessage(
-                    role=MessageRole.SYSTEM, content=load_prompt(SYSTEM_PROMPT)
-                ),
+                *self.stable_prefix,
                 *self.conversation_history,
                 ChatMessage(
                     role=MessageRole.USER,
@@ -343,18 +669,14 @@ class InteractiveTravelWorkflow(Workflow):
                 ),
             ]
 
-            with console.status("[bold yellow]Preparing clarifying questions..."):
-                perf_tracker.add_api_call()
-                clarification_response = self.llm.chat(messages)
-
-            clarification_message = clarification_response.message
+            clarification = await self._stream_final(messages, perf_tracker)
             perf_tracker.print_summary()
-            await store_conversation_memory(
+            store_conversation_memory_in_background(
                 self.base_url,
                 self.conversation_history[-1].content,
-                clarification_message.content,
+                clarification,
             )
-            return StopEvent(result=clarification_message.content)
+            return StopEvent(result=clarification)
 
 
 async def _amain():
@@ -368,7 +690,7 @@ async def _amain():
     base_url = Config.MCP_SERVER_URL
     try:
         with console.status("[bold blue]Checking MCP server..."):
-            if not await _list_tools_for_openai(base_url):
+            if not await _list_tools_for_openai(base_url, refresh=True):
                 console.print(f"[red]MCP server not found at {base_url}[/red]")
                 console.print(
                     f"[dim]Please start the server: 'python mcp_server.py'[/dim]"
@@ -378,6 +700,8 @@ async def _amain():
 
         llm = _build_llm()
         conversation_history = []
+        # Memories are read once per session so the prompt prefix stays stable
+        stable_prefix = _build_stable_prefix(await get_conversation_history(base_url))
 
         while True:
             if not conversation_history:
@@ -388,8 +712,15 @@ async def _amain():
                     conversation_history.append(
                         ChatMessage(role=MessageRole.USER, content=query)
                     )
-                    wf = InteractiveTravelWorkflow(base_url, llm, conversation_history)
-                    result_event = await wf.run()
+                    wf = InteractiveTravelWorkflow(
+                        base_url,
+                        llm,
+                        conversation_history,
+                        stable_prefix=stable_prefix,
+                        progress=_new_progress(),
+                    )
+                    with wf.progress:
+                        result_event = await wf.run()
                     final_answer = (
                         result_event.result
                         if isinstance(result_event, StopEvent)
@@ -398,24 +729,15 @@ async def _amain():
                     conversation_history.append(
                         ChatMessage(role=MessageRole.ASSISTANT, content=final_answer)
                     )
-                    console.print(
-                        Panel(
-                            final_answer,
-                            title="[bold green]Travel Agent Response[/bold green]",
-                            border_style="green",
+                    if not wf.streamed:
+                        console.print(
+                            Panel(
+                                final_answer,
+                                title="[bold green]Travel Agent Response[/bold green]",
+                                border_style="green",
+                            )
                         )
-                    )
-                    if any(
-                        word in final_answer.lower()
-                        for word in [
-                            "need",
-                            "clarify",
-                            "question",
-                            "provide",
-                            "could you",
-                            "what are",
-                        ]
-                    ):
+                    if _FOLLOWUP_RE.search(final_answer):
                         console.print(
                             "\n[dim]Continue the conversation by providing the requested information...[/dim]"
                         )
@@ -433,8 +755,15 @@ async def _amain():
             conversation_history.append(
                 ChatMessage(role=MessageRole.USER, content=query)
             )
-            wf = InteractiveTravelWorkflow(base_url, llm, conversation_history)
-            result_event = await wf.run()
+            wf = InteractiveTravelWorkflow(
+                base_url,
+                llm,
+                conversation_history,
+                stable_prefix=stable_prefix,
+                progress=_new_progress(),
+            )
+            with wf.progress:
+                result_event = await wf.run()
             final_answer = (
                 result_event.result
                 if isinstance(result_event, StopEvent)
@@ -443,13 +772,14 @@ async def _amain():
             conversation_history.append(
                 ChatMessage(role=MessageRole.ASSISTANT, content=final_answer)
             )
-            console.print(
-                Panel(
-                    final_answer,
-                    title="[bold green]Travel Plan[/bold green]",
-                    border_style="green",
+            if not wf.streamed:
+                console.print(
+                    Panel(
+                        final_answer,
+                        title="[bold green]Travel Plan[/bold green]",
+                        border_style="green",
+                    )
                 )
-            )
 
     except KeyboardInterrupt:
         console.print("\n[bold yellow]Exiting agent.[/bold yellow]")
@@ -458,6 +788,10 @@ async def _amain():
         import traceback
 
         traceback.print_exc()
+    finally:
+        await close_memory_writer()
+        await close_performance_log()
+        await close_mcp_pool()
 
 
 if __name__ == "__main__":
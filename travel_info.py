@@ -1,27 +1,89 @@
 import argparse
 import asyncio
 import base64
-import json
 import os
+import re
 import tempfile
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
 import openai
 import uvicorn
 from fastapi import FastAPI, HTTPException
-from playwright.async_api import async_playwright
 from pydantic import BaseModel
 
+from utils import json_utils
+from utils.browser import (
+    block_heavy_resources,
+    close_browser,
+    get_browser,
+    wait_for_network_quiet,
+)
+from utils.image_utils import prepare_screenshot
+
 # Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise ValueError("Please set OPENAI_API_KEY environment variable")
 
-openai.api_key = OPENAI_API_KEY
+# Async so vision calls don't block the event loop; the SDK retries 429s,
+# 5xx and timeouts with exponential backoff
+_openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=3)
 
 app = FastAPI(title="Travel Planner API", version="1.0.0")
 
+# Vision input size; a low-detail 768px JPEG is a fraction of the full-page PNG tokens
+_VISION_MAX_SIDE = 768
+_VISION_JPEG_QUALITY = 75
+
+# Local copies of captured screenshots; created once rather than per capture
+_SCREENSHOTS_DIR = "screenshots"
+os.makedirs(_SCREENSHOTS_DIR, exist_ok=True)
+
+# Page wait strategy by URL fragment; the first match wins
+_SITE_STRATEGIES = (
+    (
+        "maps.google.com",
+        {
+            "goto_timeout": 45000,
+            "selector": '[role="main"]',
+            "selector_timeout": 10000,
+            "label": "Maps: Main content selector",
+            "quiet_cap": 8.0,  # Maps needs more time
+        },
+    ),
+    (
+        "google.com/travel",
+        {
+            "goto_timeout": 30000,
+            "selector": "[data-sokoban-container]",
+            "selector_timeout": 5000,
+            "label": "Travel: Travel content",
+            "quiet_cap": 4.0,
+        },
+    ),
+)
+_DEFAULT_STRATEGY = {
+    "goto_timeout": 30000,
+    "selector": None,
+    "selector_timeout": 0,
+    "label": "",
+    "quiet_cap": 8.0,
+}
+
+# Outermost {...} span in a vision answer that may wrap JSON in prose
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Bounds concurrent page captures on the shared browser
+_CAPTURE_SEM = asyncio.Semaphore(4)
+
+# Successful analyses per (origin, destination, date, days, budget, context);
+# flight prices move faster than hotel listings
+_ANALYSIS_TTL = {"flights": 600.0, "hotels": 1800.0}
+_ANALYSIS_CACHE_MAX = 256
+_analysis_cache = {}
+
 
 class TravelRequest(BaseModel):
     origin: str
@@ -37,97 +99,102 @@ class TravelResponse(BaseModel):
     raw_analysis: List[str]
 
 
+def _prepare_for_vision(screenshot: bytes, filename: str = None) -> str:
+    """Shrink a PNG screenshot to a base64 JPEG, saving the JPEG if filename is set."""
+    jpeg = prepare_screenshot(
+        screenshot, max_side=_VISION_MAX_SIDE, quality=_VISION_JPEG_QUALITY
+    )
+    if filename:
+        with open(os.path.join(_SCREENSHOTS_DIR, filename), "wb") as f:
+            f.write(jpeg)
+    return base64.b64encode(jpeg).decode()
+
+
+async def _encode_for_vision(screenshot: bytes, filename: str = None) -> str:
+    """Run the resize, disk write and base64 encoding off the event loop."""
+    return await asyncio.to_thread(_prepare_for_vision, screenshot, filename)
+
+
 async def capture_screenshot(
     url: str, wait_selector: str = None, filename: str = None
 ) -> str:
-    """Capture screenshot and return as base64 string"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(viewport={"width": 1200, "height": 800})
-
-        # Set user agent and headers to look more like a real browser
-        await page.set_extra_http_headers(
-            {
+    """Capture screenshot and return it as a base64 JPEG sized for vision"""
+    # Reuse the shared browser; each capture only pays for a fresh context
+    try:
+        browser = await get_browser()
+        context = await browser.new_context(
+            viewport={"width": 1200, "height": 800},
+            # Headers that look more like a real browser
+            extra_http_headers={
                 "Accept-Language": "en-US,en;q=0.9",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            }
+            },
         )
+    except Exception as e:
+        print(f"Error capturing screenshot for {url}: {e}")
+        return None
 
-        try:
-            # Try different wait strategies based on the URL type
-            if "maps.google.com" in url:
-                await page.goto(url, wait_until="domcontentloaded", timeout=45000)
-                await page.wait_for_timeout(8000)  # Maps needs more time
-
-                # Try to wait for map content specifically
-                try:
-                    await page.wait_for_selector('[role="main"]', timeout=10000)
-                except:
-                    print("Maps: Main content selector not found, continuing...")
-
-            elif "google.com/travel" in url:
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                await page.wait_for_timeout(4000)
-
-                # Wait for travel content
-                try:
-                    await page.wait_for_selector(
-                        "[data-sokoban-container]", timeout=5000
-                    )
-                except:
-                    print("Travel: Travel content not found, continuing...")
-            else:
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                await page.wait_for_timeout(3000)
-
-            # Wait for specific selector if provided
-            if wait_selector:
-                try:
-                    await page.wait_for_selector(wait_selector, timeout=10000)
-                except:
-                    print(f"Custom selector {wait_selector} not found, continuing...")
-
-            # Take screenshot
-            screenshot = await page.screenshot(full_page=True)
-            screenshot_b64 = base64.b64encode(screenshot).decode()
-
-            # Save screenshot locally if filename provided
-            if filename:
-                os.makedirs("screenshots", exist_ok=True)
-                screenshot_path = f"screenshots/{filename}"
-                with open(screenshot_path, "wb") as f:
-                    f.write(screenshot)
-                print(f"📸 Screenshot saved: {screenshot_path}")
-
-            return screenshot_b64
-
-        except Exception as e:
-            print(f"Error capturing screenshot for {url}: {e}")
-            # Try a simpler approach for problematic URLs
-            if "maps.google.com" in url:
-                try:
-                    print("Retrying with simpler Maps URL...")
-                    simple_url = f"https://www.google.com/maps/dir/{url.split('/')[-3]}/{url.split('/')[-2]}"
-                    await page.goto(
-                        simple_url, wait_until="domcontentloaded", timeout=30000
-                    )
-                    await page.wait_for_timeout(5000)
-                    screenshot = await page.screenshot(full_page=True)
-                    screenshot_b64 = base64.b64encode(screenshot).decode()
-
-                    if filename:
-                        os.makedirs("screenshots", exist_ok=True)
-                        screenshot_path = f"screenshots/{filename}"
-                        with open(screenshot_path, "wb") as f:
-                            f.write(screenshot)
-                        print(f"📸 Screenshot saved (retry): {screenshot_path}")
-
-                    return screenshot_b64
-                except:
-                    pass
-            return None
-        finally:
-            await browser.close()
+    page = None
+    try:
+        # Images, fonts, media and trackers don't change the text the model reads
+        await block_heavy_resources(context)
+        page = await context.new_page()
+
+        # Load the DOM, wait for the content we need, then for the network to
+        # settle, instead of fixed sleeps
+        strategy = next(
+            (s for part, s in _SITE_STRATEGIES if part in url), _DEFAULT_STRATEGY
+        )
+        await page.goto(
+            url, wait_until="domcontentloaded", timeout=strategy["goto_timeout"]
+        )
+        if strategy["selector"]:
+            try:
+                await page.wait_for_selector(
+                    strategy["selector"], timeout=strategy["selector_timeout"]
+                )
+            except:
+                print(f"{strategy['label']} not found, continuing...")
+        await wait_for_network_quiet(page, cap=strategy["quiet_cap"])
+
+        # Wait for specific selector if provided
+        if wait_selector:
+            try:
+                await page.wait_for_selector(wait_selector, timeout=10000)
+            except:
+                print(f"Custom selector {wait_selector} not found, continuing...")
+
+        # Take screenshot
+        screenshot = await page.screenshot(full_page=True)
+        # Saved locally if filename provided
+        screenshot_b64 = await _encode_for_vision(screenshot, filename)
+        if filename:
+            print(f"📸 Screenshot saved: screenshots/{filename}")
+
+        return screenshot_b64
+
+    except Exception as e:
+        print(f"Error capturing screenshot for {url}: {e}")
+        # Try a simpler approach for problematic URLs
+        if page is not None and "maps.google.com" in url:
+            try:
+                print("Retrying with simpler Maps URL...")
+                simple_url = f"https://www.google.com/maps/dir/{url.split('/')[-3]}/{url.split('/')[-2]}"
+                await page.goto(
+                    simple_url, wait_until="domcontentloaded", timeout=30000
+                )
+                await wait_for_network_quiet(page, cap=5.0)
+                screenshot = await page.screenshot(full_page=True)
+                screenshot_b64 = await _encode_for_vision(screenshot, filename)
+                if filename:
+                    print(f"📸 Screenshot saved (retry): screenshots/{filename}")
+
+                return screenshot_b64
+            except:
+                pass
+        return None
+    finally:
+        await context.close()
 
 
 async def get_expanded_maps_url(origin: str, destination: str) -> str:
@@ -162,7 +229,7 @@ async def analyze_screenshot(screenshot_b64: str, context: str) -> str:
         return f"Failed to capture {context} screenshot"
 
     try:
-        response = openai.chat.completions.create(
+        response = await _openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -181,7 +248,8 @@ Return clean JSON only, no markdown formatting.""",
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/png;base64,{screenshot_b64}"
+                                "url": f"data:image/jpeg;base64,{screenshot_b64}",
+                                "detail": "low",
                             },
                         },
                     ],
@@ -197,6 +265,56 @@ Return clean JSON only, no markdown formatting.""",
         return f"Error analyzing {context}: {str(e)}"
 
 
+async def analyze_screenshots(screenshots: Dict[str, str]) -> Dict[str, str]:
+    """Analyze several screenshots in one vision call.
+
+    Returns the JSON analysis per context, leaving out any context the model
+    didn't answer for so the caller can fall back to analyze_screenshot.
+    """
+    contexts = list(screenshots)
+    names = ", ".join(contexts)
+    keys = ", ".join(f'"{context}"' for context in contexts)
+    content = [
+        {
+            "type": "text",
+            "text": f"""These are {len(contexts)} screenshots, in this order: {names}. Extract key information from each.
+
+For FLIGHTS: Extract flight options with airline, departure/arrival times, duration, price, stops
+For HOTELS: Extract hotel names, ratings, prices per night, location, amenities
+
+Return one clean JSON object with the keys {keys}, each holding the information from that screenshot. No markdown formatting.""",
+        }
+    ]
+    content.extend(
+        {
+            "type": "image_url",
+            "image_url": {"url": f"data:image/jpeg;base64,{b64}", "detail": "low"},
+        }
+        for b64 in screenshots.values()
+    )
+
+    try:
+        response = await _openai_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": content}],
+            max_tokens=1000 * len(contexts),
+            temperature=0.1,
+        )
+        json_match = _JSON_OBJECT_RE.search(response.choices[0].message.content)
+        combined = json_utils.loads(json_match.group()) if json_match else {}
+    except Exception as e:
+        print(f"Combined analysis failed, analyzing separately: {e}")
+        return {}
+
+    if not isinstance(combined, dict):
+        return {}
+    return {
+        context: json_utils.dumps(combined[context])
+        for context in contexts
+        if isinstance(combined.get(context), dict)
+    }
+
+
 async def get_travel_plan(request: TravelRequest) -> TravelResponse:
     """Main function to get complete travel plan"""
 
@@ -210,34 +328,74 @@ async def get_travel_plan(request: TravelRequest) -> TravelResponse:
         "📝 Note: Transport info excluded due to complexity - focusing on flights + hotels"
     )
 
-    # Capture screenshots concurrently
-    tasks = []
-    for context, url in urls.items():
+    def cache_key(context):
+        return (
+            request.origin.upper(),
+            request.destination.upper(),
+            request.date,
+            request.days,
+            request.budget,
+            context,
+        )
+
+    async def capture(context, url):
+        """Capture one page, unless its analysis is still cached."""
+        cached = _analysis_cache.get(cache_key(context))
+        if cached and time.monotonic() - cached[0] < _ANALYSIS_TTL.get(context, 600.0):
+            print(f"♻️  {context.title()} analysis served from cache")
+            return context, None, cached[1]
+
         print(f"📸 Capturing {context}: {url}")
         filename = (
-            f"{request.origin}_{request.destination}_{request.date}_{context}.png"
+            f"{request.origin}_{request.destination}_{request.date}_{context}.jpg"
         )
-        task = capture_screenshot(url, filename=filename)
-        tasks.append((context, task))
-
-    screenshots = {}
-    for context, task in tasks:
-        screenshot = await task
-        screenshots[context] = screenshot
+        async with _CAPTURE_SEM:
+            screenshot = await capture_screenshot(url, filename=filename)
         status = "✅" if screenshot else "❌"
         print(f"{status} {context.title()} screenshot captured")
+        return context, screenshot, None
+
+    captured = await asyncio.gather(
+        *(capture(context, url) for context, url in urls.items())
+    )
+    fresh = {}
+    screenshots = {}
+    for context, screenshot, cached_analysis in captured:
+        if cached_analysis is not None:
+            fresh[context] = cached_analysis
+        elif screenshot:
+            screenshots[context] = screenshot
+
+    # One vision call for all screenshots: one round trip, prompt paid once
+    new_analyses = {}
+    if len(screenshots) > 1:
+        print("🤖 Analyzing screenshots together with GPT-4o-mini...")
+        new_analyses = await analyze_screenshots(screenshots)
+    missing = [context for context in screenshots if context not in new_analyses]
+    if missing:
+        print("🤖 Analyzing screenshots with GPT-4o-mini...")
+        results = await asyncio.gather(
+            *(analyze_screenshot(screenshots[context], context) for context in missing)
+        )
+        new_analyses.update(zip(missing, results))
+
+    for context, analysis in new_analyses.items():
+        print(f"✅ {context.title()} analysis complete")
+        if not analysis.startswith("Error analyzing"):
+            key = cache_key(context)
+            _analysis_cache.pop(key, None)
+            if len(_analysis_cache) >= _ANALYSIS_CACHE_MAX:
+                del _analysis_cache[next(iter(_analysis_cache))]
+            _analysis_cache[key] = (time.monotonic(), analysis)
+    fresh.update(new_analyses)
 
-    # Analyze screenshots with Vision API
-    print("🤖 Analyzing screenshots with GPT-4o-mini...")
     analyses = {}
     raw_analyses = []
-
-    for context, screenshot in screenshots.items():
-        if screenshot:
-            analysis = await analyze_screenshot(screenshot, context)
+    for context in urls:
+        analysis = fresh.get(context)
+        if analysis is not None:
             analyses[context] = analysis
             raw_analyses.append(f"{context.title()}: {analysis}")
-            print(f"✅ {context.title()} analysis complete")
         else:
             analyses[context] = {"error": f"Failed to capture {context} screenshot"}
             raw_analyses.append(f"{context.title()}: Screenshot capture failed")
@@ -246,11 +404,9 @@ async def get_travel_plan(request: TravelRequest) -> TravelResponse:
     def safe_json_parse(text: str, fallback_key: str):
         try:
             # Try to find JSON in the response
-            import re
-
-            json_match = re.search(r"\{.*\}", text, re.DOTALL)
+            json_match = _JSON_OBJECT_RE.search(text)
             if json_match:
-                return json.loads(json_match.group())
+                return json_utils.loads(json_match.group())
             else:
                 return {"raw_text": text, "parsed": False}
         except:
@@ -274,6 +430,17 @@ async def plan_trip(request: TravelRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.on_event("startup")
+async def startup():
+    # Launch Chromium before the first request so captures only open contexts
+    await get_browser()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_browser()
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "message": "Travel Planner API is running"}
@@ -313,14 +480,17 @@ async def main_cli():
     print(f"📁 Screenshots will be saved to: screenshots/")
     print("-" * 60)
 
-    result = await get_travel_plan(request)
+    try:
+        result = await get_travel_plan(request)
+    finally:
+        await close_browser()
 
     # Pretty print results
     print("\n🛫 FLIGHTS:")
-    print(json.dumps(result.flights, indent=2))
+    print(json_utils.dumps(result.flights, indent=True))
 
     print("\n🏨 HOTELS:")
-    print(json.dumps(result.hotels, indent=2))
+    print(json_utils.dumps(result.hotels, indent=True))
 
     print("\n💡 NOTE: Transport info excluded due to complexity.")
     print("    Future versions may include simpler transport options.")
@@ -328,7 +498,7 @@ async def main_cli():
     # Save if requested
     if args.save:
         with open(args.save, "w") as f:
-            json.dump(result.dict(), f, indent=2)
+            f.write(json_utils.dumps(result.dict(), indent=True))
         print(f"\n💾 Results saved to {args.save}")
 
 
@@ -4,32 +4,84 @@ Airport utilities for the travel agent.
 Handles airport data loading and IATA code lookups.
 """
 
+import functools
+import heapq
+import math
+
 from airportsdata import load as load_airports
 
 from utils.geo_utils import haversine_km
 
-# Load airports data once at module level
-_AIRPORTS_IATA = load_airports("IATA")
-_AIRPORTS = [
-    {
-        "iata": code,
-        "name": d.get("name"),
-        "city": d.get("city"),
-        "country": d.get("country"),
-        "lat": d.get("lat"),
-        "lon": d.get("lon"),
-    }
-    for code, d in _AIRPORTS_IATA.items()
-    if isinstance(d.get("lat"), (int, float)) and isinstance(d.get("lon"), (int, float))
-]
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# City matches in these rank above other city matches
+_POPULAR_CITIES = frozenset({"portland", "seattle", "los angeles", "san francisco"})
+
+_EARTH_RADIUS_KM = 6371.0
+
+
+class _AirportIndex:
+    """Airport rows plus the search structures derived from them."""
+
+    def __init__(self):
+        self.airports = [
+            {
+                "iata": code,
+                "name": d.get("name"),
+                "city": d.get("city"),
+                "country": d.get("country"),
+                "lat": d.get("lat"),
+                "lon": d.get("lon"),
+            }
+            for code, d in load_airports("IATA").items()
+            if isinstance(d.get("lat"), (int, float))
+            and isinstance(d.get("lon"), (int, float))
+        ]
+
+        # Lowercased search fields, so lookups don't re-lower every row
+        self.search_rows = [
+            (
+                (ap["iata"] or "").lower(),
+                (ap["city"] or "").lower(),
+                (ap["name"] or "").lower(),
+                (ap["country"] or "").lower(),
+                ap,
+            )
+            for ap in self.airports
+        ]
+
+        if np is not None:
+            # Per-airport trig terms, aligned with airports, so a nearest query
+            # does no trig per row: cos(central angle) to a point (p, l) is
+            # sin(p)*sin_lat + cos(p)*cos(l)*cos_lat_cos_lon
+            #                + cos(p)*sin(l)*cos_lat_sin_lon
+            lats = np.radians(
+                np.array([ap["lat"] for ap in self.airports], dtype=np.float64)
+            )
+            lons = np.radians(
+                np.array([ap["lon"] for ap in self.airports], dtype=np.float64)
+            )
+            cos_lats = np.cos(lats)
+            self.sin_lats = np.sin(lats)
+            self.cos_lat_cos_lon = cos_lats * np.cos(lons)
+            self.cos_lat_sin_lon = cos_lats * np.sin(lons)
+
+
+@functools.lru_cache(maxsize=1)
+def _index():
+    """Build the airport index on first use rather than at import."""
+    return _AirportIndex()
 
 
 def get_airports_data():
     """Get the loaded airports data."""
-    return _AIRPORTS
+    return _index().airports
 
 
-async def iata_lookup(term, limit=5):
+def iata_lookup(term, limit=5):
     """
     Guess IATA codes by city/airport name or exact code.
     Returns a scored list of matching airports.
@@ -40,22 +92,15 @@ async def iata_lookup(term, limit=5):
     term_low = term.lower()
     scored = []
 
-    for ap in _AIRPORTS:
+    for iata, city, name, country, ap in _index().search_rows:
         score = 0
-        if ap["iata"] and term_low == ap["iata"].lower():
+        if iata and term_low == iata:
             score = 100
-        elif ap["city"] and term_low in ap["city"].lower():
-            score = 50
-            if ap["city"] and ap["city"].lower() in [
-                "portland",
-                "seattle",
-                "los angeles",
-                "san francisco",
-            ]:
-                score = 80
-        elif ap["name"] and term_low in ap["name"].lower():
+        elif city and term_low in city:
+            score = 80 if city in _POPULAR_CITIES else 50
+        elif name and term_low in name:
             score = 40
-        elif ap["country"] and term_low in ap["country"].lower():
+        elif country and term_low in country:
             score = 10
 
         if score:
@@ -65,17 +110,45 @@ async def iata_lookup(term, limit=5):
     return [ap for _, ap in scored[: max(1, min(10, limit))]]
 
 
-def find_nearest_airports(lat, lon, limit=5):
-    """Find the nearest airports to a given coordinate."""
-    scored = []
-    for ap in _AIRPORTS:
-        distance = haversine_km(lat, lon, ap["lat"], ap["lon"])
-        scored.append((distance, ap))
+def _nearest(lat, lon, k):
+    """Return (distance_km, airport) pairs for the k nearest airports, nearest first."""
+    index = _index()
+    if np is None:
+        return heapq.nsmallest(
+            k,
+            (
+                (haversine_km(lat, lon, ap["lat"], ap["lon"]), ap)
+                for ap in index.airports
+            ),
+            key=lambda x: x[0],
+        )
 
-    scored.sort(key=lambda x: x[0])
+    p = math.radians(lat)
+    l = math.radians(lon)
+    cos_p = math.cos(p)
+    # Larger cosine of the central angle means closer
+    closeness = (
+        math.sin(p) * index.sin_lats
+        + (cos_p * math.cos(l)) * index.cos_lat_cos_lon
+        + (cos_p * math.sin(l)) * index.cos_lat_sin_lon
+    )
+
+    # Partial sort: only the k closest rows are picked, then measured with the
+    # scalar haversine, which stays exact at short range
+    k = min(k, len(closeness))
+    idx = np.argpartition(-closeness, k - 1)[:k]
+    nearest = []
+    for i in idx:
+        ap = index.airports[i]
+        nearest.append((haversine_km(lat, lon, ap["lat"], ap["lon"]), ap))
+    nearest.sort(key=lambda x: x[0])
+    return nearest
 
+
+def find_nearest_airports(lat, lon, limit=5):
+    """Find the nearest airports to a given coordinate."""
     result = []
-    for distance, ap in scored[: max(1, min(10, int(limit)))]:
+    for distance, ap in _nearest(lat, lon, max(1, min(10, int(limit)))):
         result.append(
             {
                 "iata": ap["iata"],
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Browser utilities for the travel agent.
+Provides a shared headless Chromium instance for screenshot tools.
+"""
+
+import asyncio
+
+_playwright = None
+_browser = None
+_browser_lock = asyncio.Lock()
+
+
+async def get_browser():
+    """Get the shared Chromium browser, launching it on first use."""
+    global _playwright, _browser
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                # Imported lazily; Playwright pulls in a large dependency graph
+                from playwright.async_api import async_playwright
+
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True)
+    return _browser
+
+
+async def close_browser():
+    """Close the shared browser and stop Playwright."""
+    global _playwright, _browser
+    async with _browser_lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+
+
+async def wait_for_network_quiet(page, idle=1.5, cap=8.0):
+    """Wait until the page has no pending requests for `idle` seconds.
+
+    Gives up after `cap` seconds. Unlike wait_until="networkidle", this
+    settles on pages with persistent background polling.
+    """
+    pending = set()
+    page.on("request", pending.add)
+    page.on("requestfinished", pending.discard)
+    page.on("requestfailed", pending.discard)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + cap
+    quiet_since = loop.time()
+    try:
+        while loop.time() < deadline:
+            if pending:
+                quiet_since = loop.time()
+            elif loop.time() - quiet_since >= idle:
+                return
+            await asyncio.sleep(0.1)
+    finally:
+        page.remove_listener("request", pending.add)
+        page.remove_listener("requestfinished", pending.discard)
+        page.remove_listener("requestfailed", pending.discard)
+
+
+# Resources that don't affect the rendered text the vision model reads
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+_BLOCKED_URL_PARTS = ("doubleclick", "google-analytics", "googletagmanager", "/gen_204")
+
+
+async def _block_heavy_resources(route):
+    """Abort heavy or tracking requests, let everything else through."""
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+        part in request.url for part in _BLOCKED_URL_PARTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_heavy_resources(context):
+    """Skip images, media, fonts and analytics for every page in `context`."""
+    await context.route("**/*", _block_heavy_resources)
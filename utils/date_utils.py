@@ -4,10 +4,14 @@ Date utilities for the travel agent.
 Provides current date functionality.
 """
 
+import re
 from datetime import datetime
 
 from dateutil import parser as dateparser
 
+# A whitespace-separated word of two or more characters containing a digit
+_YEARLIKE_WORD_RE = re.compile(r"(?:^|\s)(?=\S*\d)\S{2,}")
+
 
 def get_current_date():
     """Returns the current date in YYYY-MM-DD format."""
@@ -20,16 +24,12 @@ def infer_future_date(date_str):
     in the past, it assumes the date is for the next year.
     """
     try:
+        today = datetime.now()
         parsed_date = dateparser.parse(
             date_str,
-            default=datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+            default=today.replace(hour=0, minute=0, second=0, microsecond=0),
         )
-        today = datetime.now()
-        year_was_specified = any(
-            char.isdigit() and len(word) >= 2
-            for word in date_str.split()
-            for char in word
-        ) and any(len(word) >= 2 for word in date_str.split())
+        year_was_specified = _YEARLIKE_WORD_RE.search(date_str) is not None
 
         if parsed_date < today:
             if not year_was_specified:
@@ -4,10 +4,28 @@ Geographic utilities for the travel agent.
 Handles geocoding, coordinate parsing, and distance calculations.
 """
 
+import asyncio
 import math
+import os
+import time
+from pathlib import Path
 
+from utils import json_utils
 from utils.http_client import get_http_client
 
+# Geocoding results keyed by normalized place name -> (stored_at, result).
+# Wall-clock timestamps so entries stay valid across restarts.
+_geocode_cache = {}
+_GEOCODE_TTL = 86400
+_GEOCODE_CACHE_MAX = 1024
+# Lookups currently in progress, so concurrent callers share one request
+_geocode_inflight = {}
+# Cache snapshot reloaded at import and written on shutdown; kept out of
+# memory/ so the travel memory tools don't treat it as a stored memory
+_GEOCODE_CACHE_FILE = (
+    Path(__file__).resolve().parent.parent / "cache" / "geocode_cache.json"
+)
+
 
 def haversine_km(lat1, lon1, lat2, lon2):
     """Calculate the great circle distance between two points on Earth in kilometers."""
@@ -34,7 +52,74 @@ async def geocode_place(name):
     """
     Geocode a place name using Nominatim (OpenStreetMap).
     Returns a dict with name, lat, lon or None if not found.
+    Successful lookups are cached for a day, across restarts.
     """
+    key = name.strip().lower()
+    now = time.time()
+    cached = _geocode_cache.get(key)
+    if cached is not None and now - cached[0] < _GEOCODE_TTL:
+        return cached[1]
+
+    task = _geocode_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_geocode(name))
+        _geocode_inflight[key] = task
+        task.add_done_callback(lambda _: _geocode_inflight.pop(key, None))
+        task.add_done_callback(lambda t: _cache_geocode(key, t))
+    # Shielded so one caller being cancelled doesn't cancel the others
+    return await asyncio.shield(task)
+
+
+async def geocode_places(names):
+    """Geocode several place names concurrently over the shared HTTP client.
+
+    Returns a list of results (dict or None) in the same order as `names`.
+    """
+    return await asyncio.gather(*(geocode_place(name) for name in names))
+
+
+def _cache_geocode(key, task):
+    """Store a finished lookup in the cache if it found something."""
+    if task.cancelled() or task.exception() is not None:
+        return
+    result = task.result()
+    if result is not None:
+        _geocode_cache.pop(key, None)
+        if len(_geocode_cache) >= _GEOCODE_CACHE_MAX:
+            # Evict the oldest entry; dicts keep insertion order
+            del _geocode_cache[next(iter(_geocode_cache))]
+        _geocode_cache[key] = (time.time(), result)
+
+
+def load_geocode_cache():
+    """Load unexpired geocoding results saved by a previous run."""
+    try:
+        with open(_GEOCODE_CACHE_FILE, "rb") as f:
+            saved = json_utils.loads(f.read())
+        now = time.time()
+        for key, (stored_at, result) in saved.items():
+            if now - stored_at < _GEOCODE_TTL:
+                _geocode_cache[key] = (stored_at, result)
+    except (OSError, AttributeError, TypeError, ValueError):
+        # A missing, truncated or malformed snapshot (JSONDecodeError is a
+        # ValueError) just means a cold cache
+        _geocode_cache.clear()
+
+
+def save_geocode_cache():
+    """Atomically write the geocoding cache to disk."""
+    try:
+        _GEOCODE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = _GEOCODE_CACHE_FILE.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            f.write(json_utils.dumps(_geocode_cache))
+        os.replace(tmp_file, _GEOCODE_CACHE_FILE)
+    except OSError as e:
+        print(f"Could not save geocode cache: {e}")
+
+
+async def _fetch_geocode(name):
+    """Query Nominatim for a single place name."""
     client = get_http_client()
     url = "https://nominatim.openstreetmap.org/search"
     params = {
@@ -49,7 +134,7 @@ async def geocode_place(name):
     try:
         r = await client.get(url, params=params, headers=headers)
         r.raise_for_status()
-        j = r.json()
+        j = json_utils.loads(r.content)
         if j and len(j) > 0:
             item = j[0]
             lat = item.get("lat")
@@ -64,3 +149,6 @@ async def geocode_place(name):
         print(f"Geocoding error for '{name}': {e}")
         return None
     return None
+
+
+load_geocode_cache()
@@ -19,7 +19,16 @@ def get_http_client() -> httpx.AsyncClient:
             Config.HTTP_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT
         )
         headers = {"User-Agent": Config.USER_AGENT}
-        _http_client = httpx.AsyncClient(timeout=timeout, headers=headers)
+        # Shared by OSRM, Open-Meteo, Wikipedia and Nominatim calls
+        limits = httpx.Limits(
+            max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0
+        )
+        # Retries cover connect errors only; limits and HTTP/2 live on the
+        # transport because a custom transport overrides the client's own
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=2)
+        _http_client = httpx.AsyncClient(
+            transport=transport, timeout=timeout, headers=headers
+        )
     return _http_client
 
 
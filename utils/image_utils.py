@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Image utilities for the travel agent.
+Shrinks page screenshots before they are sent to the vision model.
+"""
+
+import io
+
+from PIL import Image
+
+
+def prepare_screenshot(screenshot, max_height=2400, max_side=1024, quality=80):
+    """Crop a PNG screenshot to its top region, downscale it and re-encode as JPEG.
+
+    Args:
+        screenshot: Raw PNG bytes from Playwright
+        max_height: Height in pixels to keep from the top of the page
+        max_side: Maximum length of the longest side after downscaling
+        quality: JPEG quality
+
+    Returns:
+        JPEG bytes
+    """
+    img = Image.open(io.BytesIO(screenshot))
+    img = img.crop((0, 0, img.width, min(img.height, max_height)))
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
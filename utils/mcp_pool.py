@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+MCP client session pool for the travel agent.
+Keeps initialized MCP clients open per URL so repeated calls skip the handshake.
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from fastmcp.client import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+
+class _PooledSession:
+    """A pooled client plus how many callers are currently using it."""
+
+    __slots__ = ("client", "stack", "opened_at", "users", "retired")
+
+    def __init__(self, client, stack):
+        self.client = client
+        self.stack = stack
+        self.opened_at = time.monotonic()
+        self.users = 0
+        # Replaced in the pool; closed once the last user releases it
+        self.retired = False
+
+
+class MCPSessionPool:
+    """Initialized MCP clients keyed by URL, reopened after `ttl` seconds.
+
+    A session past its TTL is only closed once every caller holding it has
+    released it, so long-running calls aren't cut off mid-flight.
+    """
+
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        # url -> _PooledSession
+        self._sessions = {}
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def session(self, url, headers=None):
+        """Hold a connected client for `url` for the duration of the block."""
+        async with self._lock:
+            entry = await self._checkout(url, headers)
+            entry.users += 1
+        try:
+            yield entry.client
+        finally:
+            async with self._lock:
+                entry.users -= 1
+                if entry.retired and entry.users == 0:
+                    await self._close(entry.stack)
+
+    async def _checkout(self, url, headers):
+        """Return the live session for `url`, replacing a stale one. Needs the lock."""
+        entry = self._sessions.get(url)
+        if entry is not None:
+            if (
+                time.monotonic() - entry.opened_at < self.ttl
+                and entry.client.is_connected()
+            ):
+                return entry
+            await self._retire(url)
+
+        stack = AsyncExitStack()
+        transport = StreamableHttpTransport(url=url, headers=headers)
+        client = await stack.enter_async_context(Client(transport))
+        entry = self._sessions[url] = _PooledSession(client, stack)
+        return entry
+
+    async def _retire(self, url):
+        """Pull `url`'s session from the pool, closing it if unused. Needs the lock."""
+        entry = self._sessions.pop(url, None)
+        if entry is not None:
+            entry.retired = True
+            if entry.users == 0:
+                await self._close(entry.stack)
+
+    async def discard(self, url):
+        """Drop the session for `url`, e.g. after a failed call."""
+        async with self._lock:
+            await self._retire(url)
+
+    async def close_all(self):
+        """Close every pooled session."""
+        async with self._lock:
+            sessions, self._sessions = self._sessions, {}
+            for entry in sessions.values():
+                await self._close(entry.stack)
+
+    @staticmethod
+    async def _close(stack):
+        """Close a session's exit stack, ignoring transport errors."""
+        try:
+            await stack.aclose()
+        except Exception:
+            pass
+
+
+_mcp_pool = None
+
+
+def get_mcp_pool():
+    """Get the shared MCP session pool."""
+    global _mcp_pool
+    if _mcp_pool is None:
+        _mcp_pool = MCPSessionPool()
+    return _mcp_pool
+
+
+async def close_mcp_pool():
+    """Close the shared MCP session pool."""
+    global _mcp_pool
+    if _mcp_pool is not None:
+        await _mcp_pool.close_all()
+        _mcp_pool = None
@@ -4,21 +4,26 @@ OpenAI client utilities for the travel agent.
 Provides a shared OpenAI client for AI-powered tools.
 """
 
+import asyncio
 import base64
 import json
+import re
 from pathlib import Path
 
-import openai
-
 from config import Config
 
 _openai_client = None
 
+# Charset check for base64 payloads; decoding just to validate costs a full pass
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+
 
 def get_openai_client():
     """Get the shared OpenAI client instance."""
     global _openai_client
     if _openai_client is None:
+        import openai
+
         # Use OpenRouter if available, otherwise use OpenAI directly
         if Config.OPENROUTER_API_KEY and Config.OPENROUTER_API_KEY.startswith("sk-or-"):
             _openai_client = openai.AsyncOpenAI(
@@ -40,15 +45,29 @@ def has_openai_client():
     return client is not None
 
 
+def _load_base64_image(image_data):
+    """Resolve a file path or base64 string to bare base64, or None if invalid."""
+    if image_data.startswith("/") or image_data.startswith("./"):
+        with open(image_data, "rb") as image_file:
+            return base64.b64encode(image_file.read()).decode("utf-8")
+    base64_image = image_data
+    if base64_image.startswith("data:image/"):
+        base64_image = base64_image.split(",", 1)[1]
+    if not _BASE64_RE.fullmatch(base64_image):
+        return None
+    return base64_image
+
+
 async def analyze_image_with_vision(
-    image_data: str, prompt: str, image_format: str = "png"
+    image_data, prompt: str, image_format: str = "png", detail: str = "auto"
 ) -> dict:
     """Generic image analysis using OpenAI Vision API.
 
     Args:
-        image_data: Base64 encoded image data or file path
+        image_data: Raw image bytes, base64 encoded image data or file path
         prompt: Analysis prompt
         image_format: Image format (png, jpg, jpeg)
+        detail: Vision detail level (low, high, auto)
 
     Returns:
         Dictionary with analysis results
@@ -58,17 +77,17 @@ async def analyze_image_with_vision(
         return {"error": "OpenAI client not available", "success": False}
 
     try:
-        if image_data.startswith("/") or image_data.startswith("./"):
-            with open(image_data, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+        # Encoding, file reads and validation are CPU/disk work; keep them
+        # off the event loop
+        if isinstance(image_data, (bytes, bytearray)):
+            # Raw bytes are encoded exactly once, here at the JSON boundary
+            base64_image = await asyncio.to_thread(
+                lambda: base64.b64encode(image_data).decode("ascii")
+            )
         else:
-            base64_image = image_data
-        if base64_image.startswith("data:image/"):
-            base64_image = base64_image.split(",", 1)[1]
-        try:
-            base64.b64decode(base64_image)
-        except Exception:
-            return {"error": "Invalid base64 image data", "success": False}
+            base64_image = await asyncio.to_thread(_load_base64_image, image_data)
+            if base64_image is None:
+                return {"error": "Invalid base64 image data", "success": False}
 
         base64_image = f"data:image/{image_format};base64,{base64_image}"
         response = await client.chat.completions.create(
@@ -80,7 +99,10 @@ async def analyze_image_with_vision(
                     "role": "user",
                     "content": [
                         {"type": "text", "text": prompt},
-                        {"type": "image_url", "image_url": {"url": base64_image}},
+                        {
+                            "type": "image_url",
+                            "image_url": {"url": base64_image, "detail": detail},
+                        },
                     ],
                 }
             ],
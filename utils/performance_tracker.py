@@ -5,13 +5,18 @@ Tracks timing, token usage, and API call metrics with context manager support.
 """
 
 import asyncio
-import json
 import os
 import time
 from contextlib import asynccontextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime
 
+from utils import json_utils
+
+# Metrics waiting to be appended by the background writer
+_log_queue = None
+_log_writer_task = None
+
 
 @dataclass
 class PerformanceMetrics:
@@ -20,6 +25,7 @@ class PerformanceMetrics:
     start_time: float
     end_time: float = 0.0
     duration_seconds: float = 0.0
+    first_token_seconds: float = 0.0
     total_tokens: int = 0
     prompt_tokens: int = 0
     completion_tokens: int = 0
@@ -59,6 +65,11 @@ class PerformanceTracker:
             self.metrics.prompt_tokens + self.metrics.completion_tokens
         )
 
+    def mark_first_token(self):
+        """Record time to first streamed token, once per query."""
+        if not self.metrics.first_token_seconds:
+            self.metrics.first_token_seconds = time.time() - self.metrics.start_time
+
     def add_api_call(self):
         """Increment API call counter."""
         self.metrics.api_calls += 1
@@ -77,13 +88,29 @@ class PerformanceTracker:
         self.metrics.duration_seconds = self.metrics.end_time - self.metrics.start_time
 
     def save_to_file(self):
-        """Save metrics to JSONL log file."""
+        """Queue metrics for the background log writer.
+
+        Without a running event loop the entry is written immediately.
+        """
+        global _log_queue, _log_writer_task
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._append_to_file()
+            return
+        if _log_queue is None:
+            _log_queue = asyncio.Queue()
+            _log_writer_task = asyncio.create_task(_log_writer(self._log_file))
+        _log_queue.put_nowait(self.metrics.to_dict())
+
+    def _append_to_file(self):
+        """Append metrics to the JSONL log file right away."""
         try:
             os.makedirs(os.path.dirname(self._log_file), exist_ok=True)
             with open(self._log_file, "a") as f:
-                f.write(json.dumps(self.metrics.to_dict()) + "\n")
+                f.write(json_utils.dumps(self.metrics.to_dict()) + "\n")
         except Exception as e:
-            print(f"Warning: Could not save performance metrics: {e}")
+            _warn_save_failed(e)
 
     def print_summary(self):
         """Print a formatted summary of performance metrics."""
@@ -99,6 +126,10 @@ class PerformanceTracker:
         table.add_column("Value", style="green")
 
         table.add_row("Duration", f"{self.metrics.duration_seconds:.2f}s")
+        if self.metrics.first_token_seconds:
+            table.add_row(
+                "Time to First Token", f"{self.metrics.first_token_seconds:.2f}s"
+            )
         table.add_row("Total Tokens", f"{self.metrics.total_tokens:,}")
         table.add_row("Prompt Tokens", f"{self.metrics.prompt_tokens:,}")
         table.add_row("Completion Tokens", f"{self.metrics.completion_tokens:,}")
@@ -133,6 +164,84 @@ async def track_performance(query=""):
         tracker.save_to_file()
 
 
+def _warn_save_failed(error):
+    """Report metrics that could not be written to the log."""
+    from rich.console import Console
+
+    Console().print(
+        f"[yellow]Warning: Could not save performance metrics: {error}[/yellow]"
+    )
+
+
+def _open_log(log_file):
+    """Open the metrics log for appending, creating its directory if needed."""
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    return open(log_file, "ab")
+
+
+def _write_batch(f, data):
+    """Append a batch of serialized metrics and flush it."""
+    f.write(data)
+    # Flushed per batch so get_performance_stats sees every entry
+    f.flush()
+
+
+async def _log_writer(log_file):
+    """Append queued metrics to the log, keeping the file open between writes."""
+    # File I/O runs in a worker thread so batches don't block the event loop
+    f = None
+    try:
+        while True:
+            entries = [await _log_queue.get()]
+            while not _log_queue.empty():
+                entries.append(_log_queue.get_nowait())
+            try:
+                if f is None:
+                    # Opened here so a failed open is retried on the next batch
+                    f = await asyncio.to_thread(_open_log, log_file)
+                data = b"".join(
+                    json_utils.dumps(entry).encode() + b"\n" for entry in entries
+                )
+                await asyncio.to_thread(_write_batch, f, data)
+            except Exception as e:
+                _warn_save_failed(e)
+            finally:
+                for _ in entries:
+                    _log_queue.task_done()
+    finally:
+        if f is not None:
+            f.close()
+
+
+async def close_performance_log():
+    """Flush queued metrics and stop the background log writer."""
+    global _log_queue, _log_writer_task
+    if _log_queue is None:
+        return
+    await _log_queue.join()
+    _log_writer_task.cancel()
+    await asyncio.gather(_log_writer_task, return_exceptions=True)
+    _log_queue = None
+    _log_writer_task = None
+
+
+def _read_lines_reversed(path, chunk_size=65536):
+    """Yield the lines of a file as bytes, last line first."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # The first piece may be a partial line; finish it on the next read
+            remainder = lines.pop(0)
+            yield from reversed(lines)
+        yield remainder
+
+
 def get_performance_stats(days=7):
     """Get performance statistics from recent logs."""
     log_file = os.path.join(
@@ -152,28 +261,32 @@ def get_performance_stats(days=7):
         "total_errors": 0,
     }
 
-    durations = []
-    token_counts = []
+    duration_sum = 0.0
+    token_sum = 0
 
     try:
-        with open(log_file, "r") as f:
-            for line in f:
-                try:
-                    data = json.loads(line.strip())
-                    if data.get("start_time", 0) >= cutoff_time:
-                        stats["total_queries"] += 1
-                        durations.append(data.get("duration_seconds", 0))
-                        token_counts.append(data.get("total_tokens", 0))
-                        stats["total_api_calls"] += data.get("api_calls", 0)
-                        stats["total_tool_calls"] += data.get("tool_calls", 0)
-                        stats["total_errors"] += data.get("errors", 0)
-                except json.JSONDecodeError:
-                    continue
-
-        if durations:
-            stats["avg_duration"] = sum(durations) / len(durations)
-        if token_counts:
-            stats["avg_tokens"] = sum(token_counts) / len(token_counts)
+        # Entries are appended as queries finish, so end_time only grows down
+        # the file; reading from the end can stop at the first one too old
+        for line in _read_lines_reversed(log_file):
+            if not line.strip():
+                continue
+            try:
+                data = json_utils.loads(line)
+            except json_utils.JSONDecodeError:
+                continue
+            if data.get("end_time", 0) < cutoff_time:
+                break
+            if data.get("start_time", 0) >= cutoff_time:
+                stats["total_queries"] += 1
+                duration_sum += data.get("duration_seconds", 0)
+                token_sum += data.get("total_tokens", 0)
+                stats["total_api_calls"] += data.get("api_calls", 0)
+                stats["total_tool_calls"] += data.get("tool_calls", 0)
+                stats["total_errors"] += data.get("errors", 0)
+
+        if stats["total_queries"]:
+            stats["avg_duration"] = duration_sum / stats["total_queries"]
+            stats["avg_tokens"] = token_sum / stats["total_queries"]
 
     except Exception as e:
         return {"error": f"Could not read performance logs: {e}"}
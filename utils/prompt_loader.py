@@ -4,13 +4,16 @@ Prompt loading utilities for the travel agent.
 Loads prompts from text files in the prompts directory.
 """
 
-import os
+import functools
+from pathlib import Path
 
+_PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
 
+
+@functools.lru_cache(maxsize=64)
 def load_prompt(prompt_name):
     """Load a prompt from the prompts directory."""
-    prompts_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "prompts")
-    prompt_file = os.path.join(prompts_dir, f"{prompt_name}.txt")
+    prompt_file = _PROMPTS_DIR / f"{prompt_name}.txt"
 
     try:
         with open(prompt_file, "r", encoding="utf-8") as f:
@@ -21,6 +24,11 @@ def load_prompt(prompt_name):
         return f"Error loading prompt {prompt_name}: {e}"
 
 
+def clear_prompt_cache():
+    """Forget cached prompts so edited prompt files are read again."""
+    load_prompt.cache_clear()
+
+
 def format_prompt(prompt_name, **kwargs):
     """Load and format a prompt with variables."""
     prompt_text = load_prompt(prompt_name)
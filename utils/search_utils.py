@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Search utilities for the travel agent.
+Shared DuckDuckGo text search used by the web search and transit tools.
+"""
+
+
+def ddg_text_search(query, max_results, region="wt-wt"):
+    """Blocking DuckDuckGo text search returning shaped results.
+
+    Args:
+        query: Search query
+        max_results: Maximum number of results to return
+        region: DuckDuckGo region code (default: worldwide)
+
+    Returns:
+        List of {"title", "url", "snippet"} dictionaries
+    """
+    from duckduckgo_search import DDGS
+
+    with DDGS() as ddgs:
+        results = ddgs.text(query, region=region, max_results=max_results)
+        return [
+            {
+                "title": r.get("title", ""),
+                "url": r.get("href", ""),
+                "snippet": r.get("body", ""),
+            }
+            for r in results
+        ]